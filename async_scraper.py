@@ -0,0 +1,130 @@
+"""
+Asynchronous scraping engine for Finviz
+Fetches many quote pages concurrently while staying polite to each host
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from config import Config
+from scraper import FinvizScraper
+
+logger = logging.getLogger(__name__)
+
+class HostBudget:
+    """
+    Per-host politeness budget
+
+    Caps the number of in-flight requests per host and spaces out
+    consecutive request starts to the same host by a minimum delay.
+    """
+
+    def __init__(self, max_concurrent: int, delay: float):
+        self.max_concurrent = max_concurrent
+        self.delay = delay
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrent)
+        return self._semaphores[host]
+
+    async def acquire(self, host: str):
+        """Wait until a request to host is allowed to start"""
+        await self._semaphore(host).acquire()
+
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def release(self, host: str):
+        self._semaphore(host).release()
+
+class AsyncFinvizScraper:
+    """
+    Concurrent front-end for FinvizScraper
+
+    Network fetches run on a thread pool through the wrapped scraper so
+    they share its session and parsing code; asyncio only orchestrates
+    concurrency and politeness.
+    """
+
+    def __init__(self, scraper: Optional[FinvizScraper] = None,
+                 concurrency: Optional[int] = None,
+                 host_concurrency: Optional[int] = None,
+                 host_delay: Optional[float] = None):
+        self.scraper = scraper or FinvizScraper()
+        self.concurrency = concurrency or Config.SCRAPER_CONCURRENCY
+        self.host_concurrency = host_concurrency or Config.SCRAPER_HOST_CONCURRENCY
+        self.host_delay = Config.SCRAPER_HOST_DELAY if host_delay is None else host_delay
+
+    async def _fetch(self, executor: ThreadPoolExecutor, budget: HostBudget, url: str) -> bytes:
+        """Fetch a URL on the executor once the host budget allows it"""
+        host = urlparse(url).netloc
+        await budget.acquire(host)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self.scraper._fetch, url)
+        finally:
+            budget.release(host)
+
+    async def _scrape_news(self, executor: ThreadPoolExecutor, budget: HostBudget,
+                           semaphore: asyncio.Semaphore, symbol: str) -> List[Dict]:
+        """Fetch and parse the news table for one symbol"""
+        async with semaphore:
+            try:
+                content = await self._fetch(executor, budget, self.scraper.quote_url(symbol))
+            except requests.RequestException as e:
+                logger.warning(f"Failed to fetch quote page for {symbol}: {e}")
+                return []
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, self.scraper.parse_news_page, content, symbol
+            )
+
+    async def scrape_multiple_stocks(self, symbols: List[str], max_pages_per_stock: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Scrape news for multiple stock symbols concurrently
+
+        Args:
+            symbols: List of stock symbols
+            max_pages_per_stock: Maximum pages to scrape per stock
+
+        Returns:
+            Dictionary mapping stock symbols to their articles
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        budget = HostBudget(self.host_concurrency, self.host_delay)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = await asyncio.gather(*[
+                self._scrape_news(executor, budget, semaphore, symbol)
+                for symbol in symbols
+            ])
+
+        return dict(zip(symbols, results))
+
+    def run(self, symbols: List[str], max_pages_per_stock: int = 5) -> Dict[str, List[Dict]]:
+        """Blocking entry point for synchronous callers"""
+        coro = self.scrape_multiple_stocks(symbols, max_pages_per_stock)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(asyncio.run, coro).result()
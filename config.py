@@ -17,8 +17,65 @@ class Config:
     API_PORT = int(os.getenv("API_PORT", "8000"))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     
+    FINVIZ_BASE_URL = os.getenv("FINVIZ_BASE_URL", "https://finviz.com").rstrip("/")
+    SCRAPER_MODE = os.getenv("SCRAPER_MODE", "live").lower()
+    SCRAPER_FIXTURE_DIR = os.getenv("SCRAPER_FIXTURE_DIR", "fixtures/recorded")
     SCRAPER_DELAY = float(os.getenv("SCRAPER_DELAY", "1.0"))
     MAX_PAGES_PER_STOCK = int(os.getenv("MAX_PAGES_PER_STOCK", "5"))
+    SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "8"))
+    SCRAPER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_HOST_CONCURRENCY", "4"))
+    SCRAPER_HOST_DELAY = float(os.getenv("SCRAPER_HOST_DELAY", "0.25"))
+    SCRAPER_PARSER = os.getenv("SCRAPER_PARSER", "strainer")
+    PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 2)))
+    PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", "32"))
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "50"))
+    SENTIMENT_MODE = os.getenv("SENTIMENT_MODE", "accurate")
+    SENTIMENT_CASCADE_THRESHOLD = float(os.getenv("SENTIMENT_CASCADE_THRESHOLD", "0.3"))
+    SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+    SENTIMENT_BACKLOG_BATCH_SIZE = int(os.getenv("SENTIMENT_BACKLOG_BATCH_SIZE", "256"))
+    SENTIMENT_STAGE_INTERVAL = float(os.getenv("SENTIMENT_STAGE_INTERVAL", "30"))
+    SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", str(os.cpu_count() or 1)))
+    SENTIMENT_CHUNK_SIZE = int(os.getenv("SENTIMENT_CHUNK_SIZE", "64"))
+    SENTIMENT_POOL_MIN_TEXTS = int(os.getenv("SENTIMENT_POOL_MIN_TEXTS", "128"))
+    SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "cardiffnlp/twitter-roberta-base-sentiment-latest")
+    SENTIMENT_WARMUP = os.getenv("SENTIMENT_WARMUP", "True").lower() == "true"
+    SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch")
+    SENTIMENT_ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", ".cache/onnx")
+    SENTIMENT_ONNX_THREADS = int(os.getenv("SENTIMENT_ONNX_THREADS", str(os.cpu_count() or 1)))
+    SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+    SENTIMENT_CACHE_PERSIST = os.getenv("SENTIMENT_CACHE_PERSIST", "True").lower() == "true"
+    SCREENER_VIEW = os.getenv("SCREENER_VIEW", "152")
+    SCREENER_COLUMNS = os.getenv("SCREENER_COLUMNS", "1,2,3,4,5,6,7,14,16,52,53,54,59,63,65,66,67")
+    SCREENER_BATCH_SIZE = int(os.getenv("SCREENER_BATCH_SIZE", "100"))
+    SCREENER_PAGE_SIZE = int(os.getenv("SCREENER_PAGE_SIZE", "20"))
+    SCRAPER_RATE = float(os.getenv("SCRAPER_RATE", "2.0"))
+    SCRAPER_MIN_RATE = float(os.getenv("SCRAPER_MIN_RATE", "0.2"))
+    SCRAPER_MAX_RATE = float(os.getenv("SCRAPER_MAX_RATE", "10.0"))
+    SCRAPER_BURST = int(os.getenv("SCRAPER_BURST", "5"))
+    SCRAPER_THROTTLE_RETRIES = int(os.getenv("SCRAPER_THROTTLE_RETRIES", "3"))
+    REFRESH_TTL = int(os.getenv("REFRESH_TTL", "300"))
+    REFRESH_NEGATIVE_TTL = int(os.getenv("REFRESH_NEGATIVE_TTL", "600"))
+    REFRESH_SEARCH_LIMIT = int(os.getenv("REFRESH_SEARCH_LIMIT", "5"))
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "False").lower() == "true"
+    SCHEDULER_INTERVAL = float(os.getenv("SCHEDULER_INTERVAL", "60"))
+    SCHEDULER_REQUEST_BUDGET = int(os.getenv("SCHEDULER_REQUEST_BUDGET", "30"))
+    SCHEDULER_MARKET_TTL = int(os.getenv("SCHEDULER_MARKET_TTL", "900"))
+    SCHEDULER_CLOSED_TTL = int(os.getenv("SCHEDULER_CLOSED_TTL", "14400"))
+    SCHEDULER_POPULARITY_HALF_LIFE = float(os.getenv("SCHEDULER_POPULARITY_HALF_LIFE", "3600"))
+    JOB_QUEUE_ENABLED = os.getenv("JOB_QUEUE_ENABLED", "False").lower() == "true"
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "600"))
+    JOB_RETRY_BACKOFF = int(os.getenv("JOB_RETRY_BACKOFF", "30"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2.0"))
+    WORKER_THREADS = int(os.getenv("WORKER_THREADS", "2"))
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+    HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "True").lower() == "true"
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+    HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+    HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", "300"))
+    HTTP_CACHE_QUOTE_TTL = int(os.getenv("HTTP_CACHE_QUOTE_TTL", "60"))
     USER_AGENT = os.getenv("USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
     
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 from dotenv import load_dotenv
@@ -32,9 +32,27 @@ def create_tables():
     """Create all tables in the database"""
     try:
         Base.metadata.create_all(bind=engine)
+        add_missing_columns()
     except SQLAlchemyError as e:
         raise
 
+def add_missing_columns():
+    """
+    Add nullable columns that models gained after their table was created
+    create_all only creates missing tables, this keeps existing ones in step
+    """
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
 def test_connection():
     """Test database connection"""
     try:
@@ -0,0 +1,86 @@
+"""
+Record and replay of Finviz pages as on-disk fixtures
+In record mode live responses are saved under SCRAPER_FIXTURE_DIR, in
+replay mode they are served from there without touching the network
+"""
+
+import os
+import re
+import logging
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_MODES = ('live', 'record', 'replay')
+
+def fixture_name(url: str) -> str:
+    """
+    File name for a URL, built from its path and query only so fixtures
+    recorded against finviz.com replay against any base URL
+    """
+    parts = urlsplit(url)
+    key = parts.path.strip('/') or 'index'
+    if parts.query:
+        key += '_' + parts.query
+    return re.sub(r'[^A-Za-z0-9.=,-]+', '_', key) + '.html'
+
+class FixtureHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter that records GET responses to, or replays them from,
+    a fixture directory depending on the scraper mode
+    """
+
+    def __init__(self, mode: Optional[str] = None, fixture_dir: Optional[str] = None, **kwargs):
+        self.mode = mode or Config.SCRAPER_MODE
+        if self.mode not in SCRAPER_MODES:
+            raise ValueError(f"Unknown scraper mode '{self.mode}', expected one of: {', '.join(SCRAPER_MODES)}")
+        self.fixture_dir = fixture_dir or Config.SCRAPER_FIXTURE_DIR
+        super().__init__(**kwargs)
+
+    def fixture_path(self, url: str) -> str:
+        return os.path.join(self.fixture_dir, fixture_name(url))
+
+    def send(self, request, **kwargs):
+        if self.mode == 'live' or request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        path = self.fixture_path(request.url)
+
+        if self.mode == 'replay':
+            return self._replay(request, path)
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 200:
+            os.makedirs(self.fixture_dir, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(response.content)
+            logger.info(f"Recorded {request.url} to {path}")
+        return response
+
+    def _replay(self, request, path: str) -> requests.Response:
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.connection = self
+
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                response._content = f.read()
+            response.status_code = 200
+            response.reason = 'OK'
+        else:
+            logger.warning(f"No recorded fixture for {request.url}")
+            response._content = b''
+            response.status_code = 404
+            response.reason = 'Not Found'
+
+        response.headers = CaseInsensitiveDict({'Content-Type': 'text/html; charset=utf-8'})
+        response.encoding = 'utf-8'
+        return response
@@ -0,0 +1,124 @@
+"""
+Multi-ticker headline tagging
+An Aho-Corasick automaton over every known ticker and company alias finds
+all symbols mentioned in a headline in a single linear pass
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+from symbol_registry import SymbolRegistry, symbol_registry
+
+# Tickers that are ordinary words or letters, only matched through their company aliases
+AMBIGUOUS_TICKERS = {
+    'ALL', 'ARE', 'IT', 'ON', 'NOW', 'KEY', 'LOW', 'HAS', 'CAT', 'SO', 'WELL', 'POOL',
+    'COST', 'TECH', 'MAS', 'MET', 'PEG', 'ES', 'ED', 'DE', 'IP', 'IR', 'BR', 'CE', 'CF',
+    'CL', 'PM', 'TAP', 'FAST', 'GEN', 'MOS', 'LIN', 'AME', 'GL', 'NI', 'RF', 'HAL', 'BEN',
+    'EL', 'AN', 'BIO', 'DG', 'HE', 'MA', 'MO', 'CB', 'EA', 'NET', 'SNOW', 'SHOP', 'SPOT',
+    'HOOD', 'COIN', 'SNAP', 'PINS', 'LITE', 'SAIL', 'EMAN', 'ROK', 'USB', 'PKG', 'TEL',
+}
+
+# Company aliases that are ordinary words, left out of tagging but kept for a symbol's own news page
+AMBIGUOUS_ALIASES = {
+    'NEWS', 'MATCH', 'BALL', 'GENERAL', 'PUBLIC', 'SOUTHERN', 'NORTHERN', 'AMERICAN',
+    'GLOBAL', 'UNITED', 'FIRST', 'REGIONS', 'CITIZENS', 'PRINCIPAL', 'ESSEX', 'EQUITY',
+    'POOL', 'PROGRESSIVE', 'TRAVELERS', 'CARRIER', 'WEST', 'CAPITAL', 'TARGET', 'DOW',
+    'BOOKING', 'FOX', 'ALIGN', 'HP', 'CHARTER', 'VISA', 'WATERS', 'ZEBRA', 'SQUARE', 'BLOCK',
+    'ZOOM', 'ELASTIC', 'COHERENT', 'DIODES', 'MOSAIC', 'CARNIVAL', 'DOVER', 'COOPER',
+}
+
+ASCII_UPPER = str.maketrans('abcdefghijklmnopqrstuvwxyz', 'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton mapping each pattern to a list of payloads
+    """
+
+    def __init__(self, patterns: Dict[str, List]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, object]]] = [[]]
+
+        for pattern, payloads in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].extend((pattern, payload) for payload in payloads)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str, object]]:
+        """Yield (start, end, pattern, payload) for every occurrence in text"""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for pattern, payload in self._output[state]:
+                end = index + 1
+                yield end - len(pattern), end, pattern, payload
+
+class HeadlineTagger:
+    """
+    Finds every registry symbol mentioned in a headline
+
+    Company aliases match case-insensitively. Bare tickers must appear in
+    upper case, and tickers that double as common words are only found
+    through their aliases.
+    """
+
+    def __init__(self, registry: SymbolRegistry):
+        patterns: Dict[str, List] = {}
+
+        for entry in registry:
+            if len(entry.symbol) > 1 and entry.symbol not in AMBIGUOUS_TICKERS:
+                patterns.setdefault(entry.symbol, []).append((entry.symbol, True))
+            for alias in entry.aliases:
+                if alias not in AMBIGUOUS_ALIASES:
+                    patterns.setdefault(alias, []).append((entry.symbol, False))
+
+        self._automaton = AhoCorasick(patterns)
+
+    def tag(self, headline: str) -> List[str]:
+        """Symbols mentioned in headline, in order of first appearance"""
+        if not headline:
+            return []
+
+        upper = headline.translate(ASCII_UPPER)
+        first_seen: Dict[str, int] = {}
+
+        for start, end, pattern, (symbol, is_ticker) in self._automaton.iter_matches(upper):
+            if symbol in first_seen and first_seen[symbol] <= start:
+                continue
+            if _is_word_char(pattern[0]) and start > 0 and _is_word_char(upper[start - 1]):
+                continue
+            if _is_word_char(pattern[-1]) and end < len(upper) and _is_word_char(upper[end]):
+                continue
+            if is_ticker and headline[start:end] != pattern:
+                continue
+            first_seen[symbol] = start
+
+        return sorted(first_seen, key=first_seen.get)
+
+headline_tagger = HeadlineTagger(symbol_registry)
@@ -0,0 +1,205 @@
+"""
+HTTP response cache for the scraper session
+Serves fresh responses from a local disk store and revalidates stale ones
+with conditional GETs (ETag / Last-Modified)
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding rather than the stored body
+HOP_BY_HOP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+class ResponseCache:
+    """
+    Size-bounded on-disk LRU store of GET responses keyed by URL
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, 'responses.sqlite')
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the stored entry for url and mark it as recently used"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, etag, last_modified, expires_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if not row:
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+        status, headers, body, etag, last_modified, expires_at = row
+        return {
+            'status': status,
+            'headers': json.loads(headers),
+            'body': body,
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': expires_at
+        }
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes, expires_at: float):
+        """Store a response and evict least recently used entries over the size bound"""
+        size = len(body)
+        if size > self.max_bytes:
+            return
+
+        validators = CaseInsensitiveDict(headers)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(dict(headers)), body, validators.get('ETag'),
+                 validators.get('Last-Modified'), expires_at, time.time(), size)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, expires_at: float):
+        """Extend the lifetime of an entry after a successful revalidation"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ? WHERE url = ?",
+                (expires_at, time.time(), url)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+def default_ttl_rules() -> List[Tuple[re.Pattern, int]]:
+    """Per-URL cache lifetimes in seconds, first match wins"""
+    return [
+        (re.compile(r'/(quote|screener)\.ashx'), Config.HTTP_CACHE_QUOTE_TTL),
+    ]
+
+class CachingHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter that answers GETs from a ResponseCache
+
+    Fresh entries are returned without touching the network. Expired
+    entries are revalidated with If-None-Match / If-Modified-Since and
+    reused on 304 Not Modified.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None,
+                 ttl_rules: Optional[List[Tuple[re.Pattern, int]]] = None,
+                 default_ttl: Optional[int] = None, **kwargs):
+        self.cache = cache
+        self.ttl_rules = default_ttl_rules() if ttl_rules is None else ttl_rules
+        self.default_ttl = Config.HTTP_CACHE_TTL if default_ttl is None else default_ttl
+        super().__init__(**kwargs)
+
+    def ttl_for(self, url: str) -> int:
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def send(self, request, **kwargs):
+        if self.cache is None or request.method != 'GET' or kwargs.get('stream'):
+            return super().send(request, **kwargs)
+
+        url = request.url
+        entry = self.cache.get(url)
+
+        if entry and entry['expires_at'] > time.time():
+            return self._build_response(request, entry)
+
+        if entry:
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+        expires_at = time.time() + self.ttl_for(url)
+
+        if response.status_code == 304 and entry:
+            self.cache.refresh(url, expires_at)
+            return self._build_response(request, entry)
+
+        if response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', ''):
+            headers = {
+                key: value for key, value in response.headers.items()
+                if key.lower() not in HOP_BY_HOP_HEADERS
+            }
+            self.cache.put(url, response.status_code, headers, response.content, expires_at)
+
+        response.from_cache = False
+        return response
+
+    def _build_response(self, request, entry: Dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = entry['body']
+        response.reason = 'OK'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return response
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache shared by every scraper"""
+    global _response_cache
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(Config.HTTP_CACHE_DIR, Config.HTTP_CACHE_MAX_BYTES)
+        return _response_cache
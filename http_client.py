@@ -0,0 +1,67 @@
+"""
+Process-wide HTTP client for Finviz
+One sized transport adapter holds the keep-alive connection pool for the
+whole process, and each thread gets its own lightweight Session on top of it
+"""
+
+import threading
+import logging
+from typing import Optional
+
+import requests
+
+from config import Config
+from fixture_replay import FixtureHTTPAdapter
+from http_cache import CachingHTTPAdapter, get_response_cache
+from rate_limiter import RateLimitedHTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+class FinvizHTTPAdapter(FixtureHTTPAdapter, CachingHTTPAdapter, RateLimitedHTTPAdapter):
+    """
+    Fixture record/replay, then the response cache in front of the shared
+    rate limiter, so replayed pages and cache hits cost no tokens
+    """
+
+_adapter: Optional[FinvizHTTPAdapter] = None
+_adapter_lock = threading.Lock()
+_local = threading.local()
+
+def get_adapter() -> FinvizHTTPAdapter:
+    """Shared adapter whose connection pool is reused by every session"""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = FinvizHTTPAdapter(
+                cache=get_response_cache() if Config.HTTP_CACHE_ENABLED else None,
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_SIZE
+            )
+        return _adapter
+
+def get_session() -> requests.Session:
+    """
+    Session for the calling thread
+
+    requests.Session is not guaranteed to be thread-safe, so sessions are
+    thread-local while the urllib3 pool behind them is shared.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        adapter = get_adapter()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _local.session = session
+    return session
+
+def close_http_client():
+    """Drop pooled connections, e.g. on application shutdown"""
+    with _adapter_lock:
+        if _adapter is not None:
+            _adapter.close()
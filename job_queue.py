@@ -0,0 +1,240 @@
+"""
+Durable job queue stored in the application database
+Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED so any number of
+worker processes can share the table without handing out a job twice
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from config import Config
+from database import SessionLocal
+from models import Job
+from scraper import FinvizScraper
+from services import NewsService, StockService
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+class JobError(Exception):
+    """Raised when a job handler reports a failure"""
+
+def _scrape_stock(db: Session, scraper: FinvizScraper, symbol: str) -> Dict[str, Any]:
+    service = StockService(db, scraper=scraper)
+    result = service.scrape_and_save_quote(symbol)
+    if result.get('error'):
+        raise JobError(result['error'])
+    if not result['stock_updated']:
+        raise JobError(f"No stock data scraped for {symbol}")
+    return {**result, 'price': service.get_stock(symbol).price}
+
+def _scrape_news(db: Session, scraper: FinvizScraper, symbol: Optional[str] = None, limit: int = 50) -> Dict[str, Any]:
+    return NewsService(db, scraper=scraper).scrape_and_save_news(symbol, limit)
+
+def _bulk_scrape_stocks(db: Session, scraper: FinvizScraper, symbols: list) -> Dict[str, Any]:
+    return StockService(db, scraper=scraper).bulk_scrape_stocks(symbols)
+
+def _analyze_sentiment(db: Session, scraper: FinvizScraper, symbol: Optional[str] = None, limit: int = 100,
+                       mode: Optional[str] = None) -> Dict[str, Any]:
+    return NewsService(db, scraper=scraper).analyze_news_sentiment(symbol, limit, mode)
+
+def _analyze_sentiment_backlog(db: Session, scraper: FinvizScraper, symbol: Optional[str] = None,
+                               mode: Optional[str] = None) -> Dict[str, Any]:
+    return NewsService(db, scraper=scraper).analyze_backlog(symbol, mode)
+
+# Job kind -> handler(db, scraper, **payload)
+JOB_HANDLERS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'scrape_stock': _scrape_stock,
+    'scrape_news': _scrape_news,
+    'bulk_scrape_stocks': _bulk_scrape_stocks,
+    'analyze_sentiment': _analyze_sentiment,
+    'analyze_sentiment_backlog': _analyze_sentiment_backlog,
+}
+
+def enqueue(db: Session, kind: str, payload: Optional[Dict[str, Any]] = None, priority: int = 0,
+            max_attempts: Optional[int] = None, delay: float = 0) -> Job:
+    """Add a job to the queue, higher priority jobs are dequeued first"""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}', expected one of: {', '.join(JOB_HANDLERS)}")
+
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload or {}),
+        priority=priority,
+        max_attempts=max_attempts or Config.JOB_MAX_ATTEMPTS,
+        run_at=datetime.now() + timedelta(seconds=delay)
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def dequeue(db: Session, worker_id: str, visibility_timeout: Optional[int] = None) -> Optional[Job]:
+    """
+    Claim the next runnable job
+
+    Queued jobs are runnable once run_at has passed. A running job whose
+    worker did not finish it within the visibility timeout is handed out
+    again. While a job runs, run_at holds the end of its visibility window.
+    """
+    visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+
+    while True:
+        now = datetime.now()
+        job = db.query(Job).filter(
+            Job.status.in_(('queued', 'running')),
+            Job.run_at <= now
+        ).order_by(
+            Job.priority.desc(), Job.run_at, Job.id
+        ).with_for_update(skip_locked=True).first()
+
+        if job is None:
+            db.rollback()
+            return None
+
+        if job.status != 'running':
+            break
+
+        logger.warning(f"Job {job.id} timed out on {job.locked_by}")
+        if job.attempts < job.max_attempts:
+            break
+        fail(db, job, f"Visibility timeout expired on {job.locked_by}", job.locked_by)
+
+    job.status = 'running'
+    job.locked_by = worker_id
+    job.attempts += 1
+    job.run_at = now + timedelta(seconds=visibility_timeout)
+    db.commit()
+    return job
+
+def _update_owned(db: Session, job: Job, worker_id: str, values: Dict[str, Any]) -> bool:
+    """Update a job only while worker_id still holds its lease, returning whether it did"""
+    updated = db.query(Job).filter(
+        Job.id == job.id,
+        Job.locked_by == worker_id
+    ).update(values, synchronize_session=False)
+    db.commit()
+    if not updated:
+        logger.warning(f"Job {job.id} lease lost by {worker_id}, outcome discarded")
+    return bool(updated)
+
+def extend_lease(db: Session, job_id: int, worker_id: str, visibility_timeout: Optional[int] = None) -> bool:
+    """Push back the end of a running job's visibility window, returning False once the lease is lost"""
+    visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+    updated = db.query(Job).filter(
+        Job.id == job_id,
+        Job.locked_by == worker_id,
+        Job.status == 'running'
+    ).update({'run_at': datetime.now() + timedelta(seconds=visibility_timeout)}, synchronize_session=False)
+    db.commit()
+    return bool(updated)
+
+def complete(db: Session, job: Job, result: Any, worker_id: str) -> bool:
+    return _update_owned(db, job, worker_id, {
+        'status': 'done',
+        'result': json.dumps(result, default=str),
+        'locked_by': None
+    })
+
+def fail(db: Session, job: Job, error: str, worker_id: str) -> bool:
+    """Record a failure and schedule a retry with exponential backoff while attempts remain"""
+    values = {'last_error': error, 'locked_by': None}
+    if job.attempts < job.max_attempts:
+        values['status'] = 'queued'
+        values['run_at'] = datetime.now() + timedelta(seconds=Config.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1))
+    else:
+        values['status'] = 'failed'
+    return _update_owned(db, job, worker_id, values)
+
+def _heartbeat(job_id: int, worker_id: str, visibility_timeout: int, stop: threading.Event,
+               session_factory: Callable[[], Session]):
+    """Keep extending a job's lease on its own session until stopped or the lease is lost"""
+    while not stop.wait(visibility_timeout / 3):
+        db = session_factory()
+        try:
+            if not extend_lease(db, job_id, worker_id, visibility_timeout):
+                logger.warning(f"Job {job_id} lease lost by {worker_id}")
+                return
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to extend the lease of job {job_id}: {e}")
+        finally:
+            db.close()
+
+def run_job(db: Session, job: Job, scraper: Optional[FinvizScraper] = None,
+            visibility_timeout: Optional[int] = None,
+            session_factory: Callable[[], Session] = SessionLocal) -> bool:
+    """
+    Run a claimed job and record its outcome, returning whether it succeeded
+
+    A heartbeat thread extends the lease while the handler runs. The outcome
+    is only recorded while this worker still holds the lease.
+    """
+    visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+    worker_id = job.locked_by
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(job.id, worker_id, visibility_timeout, stop, session_factory),
+        name=f'job-{job.id}-heartbeat', daemon=True
+    )
+    heartbeat.start()
+    try:
+        result = JOB_HANDLERS[job.kind](db, scraper or FinvizScraper(), **json.loads(job.payload))
+        if isinstance(result, dict) and result.get('error'):
+            raise JobError(result['error'])
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {e}")
+        stop.set()
+        heartbeat.join()
+        fail(db, job, str(e), worker_id)
+        return False
+
+    stop.set()
+    heartbeat.join()
+    return complete(db, job, result, worker_id)
+
+def _run_inline(kind: str, payload: Dict[str, Any], scraper: Optional[FinvizScraper]):
+    db = SessionLocal()
+    try:
+        JOB_HANDLERS[kind](db, scraper or FinvizScraper(), **payload)
+    except Exception as e:
+        logger.error(f"Background {kind} failed: {e}")
+    finally:
+        db.close()
+
+def submit(background_tasks: BackgroundTasks, db: Session, kind: str, payload: Optional[Dict[str, Any]] = None,
+           priority: int = 0, scraper: Optional[FinvizScraper] = None) -> Optional[Job]:
+    """
+    Hand work to the durable queue when JOB_QUEUE_ENABLED, otherwise run it
+    as an in-process background task as before
+    """
+    if Config.JOB_QUEUE_ENABLED:
+        return enqueue(db, kind, payload, priority=priority)
+
+    background_tasks.add_task(_run_inline, kind, payload or {}, scraper)
+    return None
+
+def queue_stats(db: Session) -> Dict[str, Any]:
+    counts = dict(db.query(Job.status, func.count(Job.id)).group_by(Job.status).all())
+    ready = db.query(func.count(Job.id)).filter(
+        and_(Job.status == 'queued', Job.run_at <= datetime.now())
+    ).scalar()
+    expired = db.query(func.count(Job.id)).filter(
+        and_(Job.status == 'running', Job.run_at <= datetime.now())
+    ).scalar()
+    return {
+        'enabled': Config.JOB_QUEUE_ENABLED,
+        'by_status': {status: counts.get(status, 0) for status in JOB_STATUSES},
+        'ready': ready,
+        'expired_leases': expired
+    }
@@ -4,12 +4,22 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime, timedelta
+import json
 import logging
 
+from config import Config
 from database import get_db, create_tables, test_connection
-from models import NewsArticle, Stock
+from models import NewsArticle, Stock, Job
 from scraper import FinvizScraper
-from services import StockService, NewsService
+from http_client import close_http_client
+from job_queue import queue_stats, submit as submit_job
+from parse_pipeline import close_parse_pool
+from rate_limiter import get_rate_limiter
+from refresh_coordinator import get_refresh_coordinator
+from refresh_scheduler import get_refresh_scheduler
+from sentiment_analyzer import sentiment_analyzer
+from sentiment_pool import close_lexicon_pool
+from services import StockService, NewsService, article_symbol_filter
 from pydantic import BaseModel
 
 logging.basicConfig(level=logging.INFO)
@@ -62,6 +72,20 @@ async def startup_event():
         raise Exception("Database connection failed")
     
     create_tables()
+    
+    if Config.SENTIMENT_WARMUP and sentiment_analyzer.needs_model():
+        sentiment_analyzer.warmup()
+    
+    if Config.SCHEDULER_ENABLED:
+        get_refresh_scheduler().start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the refresh scheduler and release pooled HTTP connections, parser and sentiment workers"""
+    get_refresh_scheduler().stop()
+    close_http_client()
+    close_parse_pool()
+    close_lexicon_pool()
 
 @app.get("/")
 async def root():
@@ -76,9 +100,14 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     db_status = test_connection()
+    model_status = sentiment_analyzer.model_status()
     return {
         "status": "healthy" if db_status else "unhealthy",
+        "ready": db_status and model_status["ready"],
         "database": "connected" if db_status else "disconnected",
+        "sentiment_model": model_status,
+        "sentiment_cache": sentiment_analyzer.cache.stats(),
+        "sentiment_cascade": sentiment_analyzer.cascade_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -94,46 +123,20 @@ async def scrape_news(
         
         total_articles = 0
         articles_by_symbol = {}
+        service = NewsService(db, scraper=scraper)
         
         for symbol in request.symbols:
             try:
-                articles = scraper.get_news_for_stock(symbol, request.max_pages_per_stock)
-                
-                stored_count = 0
-                for article_data in articles:
-                    try:
-                        existing_article = db.query(NewsArticle).filter(
-                            NewsArticle.link == article_data['link']
-                        ).first()
-                        
-                        if not existing_article:
-                            db_article = NewsArticle(
-                                title=article_data['title'],
-                                link=article_data['link'],
-                                summary=article_data.get('summary', ''),
-                                source=article_data.get('source', ''),
-                                stock_symbol=article_data['stock_symbol'],
-                                published_date=article_data.get('published_date')
-                            )
-                            
-                            db.add(db_article)
-                            stored_count += 1
-                        else:
-                            continue
-                    
-                    except Exception as e:
-                        continue
-                
-                db.commit()
+                result = service.scrape_new_news(symbol, request.max_pages_per_stock)
                 
                 articles_by_symbol[symbol] = {
-                    "scraped": len(articles),
-                    "stored": stored_count
+                    "scraped": result['scraped'],
+                    "stored": result['saved']
                 }
-                total_articles += stored_count
-                
+                total_articles += result['saved']
                 
             except Exception as e:
+                db.rollback()
                 articles_by_symbol[symbol] = {
                     "scraped": 0,
                     "stored": 0,
@@ -164,7 +167,7 @@ async def get_news(
         query = db.query(NewsArticle)
         
         if symbol:
-            query = query.filter(NewsArticle.stock_symbol == symbol.upper())
+            query = query.filter(article_symbol_filter(symbol))
         
         if days_back:
             cutoff_date = datetime.now() - timedelta(days=days_back)
@@ -252,7 +255,7 @@ async def get_stocks(
     db: Session = Depends(get_db)
 ):
     """Get all stocks with pagination"""
-    service = StockService(db)
+    service = StockService(db, scraper=scraper)
     stocks = service.get_all_stocks(limit=limit, offset=offset)
     return {
         "stocks": [
@@ -280,16 +283,16 @@ async def search_stocks(
     db: Session = Depends(get_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
-    """Search stocks by symbol or name and automatically rescrape data"""
-    service = StockService(db)
+    """Search stocks by symbol or name and rescrape the top results when stale"""
+    service = StockService(db, scraper=scraper)
     stocks = service.search_stocks(q, limit=limit)
     
-    for stock in stocks:
-        background_tasks.add_task(service.scrape_and_save_stock, stock.symbol)
+    for stock in stocks[:Config.REFRESH_SEARCH_LIMIT]:
+        get_refresh_scheduler().popularity.record(stock.symbol, weight=0.25)
     
-    news_service = NewsService(db)
-    for stock in stocks:
-        background_tasks.add_task(news_service.scrape_and_save_news, stock.symbol, 10)
+    refreshing = get_refresh_coordinator().schedule(
+        background_tasks, db, [stock.symbol for stock in stocks], limit=Config.REFRESH_SEARCH_LIMIT
+    )
     
     return {
         "stocks": [
@@ -304,7 +307,8 @@ async def search_stocks(
             }
             for stock in stocks
         ],
-        "message": f"Found {len(stocks)} stocks. Rescraping stock data and news in background for fresh results."
+        "refreshing": refreshing,
+        "message": f"Found {len(stocks)} stocks. Refreshing {len(refreshing)} stale stocks in background."
     }
 
 @app.get("/api/stocks/{symbol}")
@@ -313,17 +317,15 @@ async def get_stock(
     db: Session = Depends(get_db),
     background_tasks: BackgroundTasks = BackgroundTasks()
 ):
-    """Get specific stock by symbol and automatically rescrape data"""
-    service = StockService(db)
+    """Get specific stock by symbol and rescrape it in background when stale"""
+    service = StockService(db, scraper=scraper)
     stock = service.get_stock(symbol.upper())
     
     if not stock:
         raise HTTPException(status_code=404, detail="Stock not found")
     
-    background_tasks.add_task(service.scrape_and_save_stock, symbol.upper())
-    
-    news_service = NewsService(db)
-    background_tasks.add_task(news_service.scrape_and_save_news, symbol.upper(), 10)
+    get_refresh_scheduler().popularity.record(stock.symbol)
+    get_refresh_coordinator().schedule(background_tasks, db, [stock.symbol])
     
     return {
         "symbol": stock.symbol,
@@ -362,11 +364,9 @@ async def scrape_stock(
     db: Session = Depends(get_db)
 ):
     """Scrape and update stock data"""
-    service = StockService(db)
-    
-    background_tasks.add_task(service.scrape_and_save_stock, symbol.upper())
+    job = submit_job(background_tasks, db, 'scrape_stock', {'symbol': symbol.upper()}, scraper=scraper)
     
-    return {"message": f"Scraping initiated for {symbol.upper()}"}
+    return {"message": f"Scraping initiated for {symbol.upper()}", "job_id": job.id if job else None}
 
 @app.get("/api/news")
 async def get_news_api(
@@ -376,9 +376,12 @@ async def get_news_api(
     db: Session = Depends(get_db)
 ):
     """Get financial news"""
-    service = NewsService(db)
+    service = NewsService(db, scraper=scraper)
     news = service.get_news(symbol, limit=limit, offset=offset)
     
+    if symbol:
+        get_refresh_scheduler().popularity.record(symbol)
+    
     return {
         "news": [
             {
@@ -404,7 +407,7 @@ async def get_recent_news_api(
     db: Session = Depends(get_db)
 ):
     """Get recent news within specified hours"""
-    service = NewsService(db)
+    service = NewsService(db, scraper=scraper)
     news = service.get_recent_news(hours=hours, limit=limit)
     
     return {
@@ -432,17 +435,15 @@ async def scrape_news_api(
     db: Session = Depends(get_db)
 ):
     """Scrape and update news"""
-    service = NewsService(db)
+    job = submit_job(background_tasks, db, 'scrape_news', {'symbol': symbol, 'limit': limit}, scraper=scraper)
     
-    background_tasks.add_task(service.scrape_and_save_news, symbol, limit)
-    
-    return {"message": f"News scraping initiated for {symbol or 'all stocks'}"}
+    return {"message": f"News scraping initiated for {symbol or 'all stocks'}", "job_id": job.id if job else None}
 
 @app.get("/api/stats")
 async def get_statistics_api(db: Session = Depends(get_db)):
     """Get database statistics"""
-    stock_service = StockService(db)
-    news_service = NewsService(db)
+    stock_service = StockService(db, scraper=scraper)
+    news_service = NewsService(db, scraper=scraper)
     
     stock_stats = stock_service.get_stock_statistics()
     news_stats = news_service.get_news_statistics()
@@ -453,6 +454,44 @@ async def get_statistics_api(db: Session = Depends(get_db)):
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/api/scraper/stats")
+async def get_scraper_statistics():
+    """Get upstream rate limiter and background refresh statistics"""
+    return {
+        "rate_limiter": get_rate_limiter().stats(),
+        "refresh": get_refresh_coordinator().stats(),
+        "scheduler": get_refresh_scheduler().stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/api/jobs")
+async def get_job_statistics(db: Session = Depends(get_db)):
+    """Get job queue statistics"""
+    return {
+        "jobs": queue_stats(db),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Get the status of a queued job"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "last_error": job.last_error,
+        "result": json.loads(job.result) if job.result else None,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None
+    }
+
 @app.post("/api/stocks/bulk-scrape")
 async def bulk_scrape_stocks(
     symbols: List[str],
@@ -463,11 +502,9 @@ async def bulk_scrape_stocks(
     if len(symbols) > 50:
         raise HTTPException(status_code=400, detail="Maximum 50 symbols allowed per request")
     
-    service = StockService(db)
+    job = submit_job(background_tasks, db, 'bulk_scrape_stocks', {'symbols': symbols}, scraper=scraper)
     
-    background_tasks.add_task(service.bulk_scrape_stocks, symbols)
-    
-    return {"message": f"Bulk scraping initiated for {len(symbols)} symbols"}
+    return {"message": f"Bulk scraping initiated for {len(symbols)} symbols", "job_id": job.id if job else None}
 
 @app.post("/api/stocks/popular-scrape")
 async def scrape_popular_stocks(
@@ -477,25 +514,36 @@ async def scrape_popular_stocks(
     """Scrape popular stocks"""
     popular_symbols = scraper.get_popular_stocks()
     
-    service = StockService(db)
-    
-    background_tasks.add_task(service.bulk_scrape_stocks, popular_symbols)
+    job = submit_job(background_tasks, db, 'bulk_scrape_stocks', {'symbols': popular_symbols}, scraper=scraper)
     
-    return {"message": f"Scraping initiated for {len(popular_symbols)} popular stocks"}
+    return {"message": f"Scraping initiated for {len(popular_symbols)} popular stocks", "job_id": job.id if job else None}
 
 @app.post("/api/sentiment/analyze")
 async def analyze_sentiment(
     symbol: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=500),
+    mode: Optional[str] = Query(None, regex="^(fast|balanced|accurate|cascade)$"),
     background_tasks: BackgroundTasks = None,
     db: Session = Depends(get_db)
 ):
-    """Analyze sentiment for news articles"""
-    service = NewsService(db)
+    """Analyze sentiment for news articles, mode trades accuracy for speed"""
+    mode = mode or Config.SENTIMENT_MODE
+    job = submit_job(background_tasks, db, 'analyze_sentiment', {'symbol': symbol, 'limit': limit, 'mode': mode}, scraper=scraper)
     
-    background_tasks.add_task(service.analyze_news_sentiment, symbol, limit)
+    return {"message": f"Sentiment analysis ({mode}) initiated for {symbol or 'all articles'}", "job_id": job.id if job else None}
+
+@app.post("/api/sentiment/backlog")
+async def analyze_sentiment_backlog(
+    symbol: Optional[str] = Query(None),
+    mode: Optional[str] = Query(None, regex="^(fast|balanced|accurate|cascade)$"),
+    background_tasks: BackgroundTasks = None,
+    db: Session = Depends(get_db)
+):
+    """Score every unanalyzed article in batches until the backlog is drained"""
+    mode = mode or Config.SENTIMENT_MODE
+    job = submit_job(background_tasks, db, 'analyze_sentiment_backlog', {'symbol': symbol, 'mode': mode}, scraper=scraper)
     
-    return {"message": f"Sentiment analysis initiated for {symbol or 'all articles'}"}
+    return {"message": f"Sentiment backlog ({mode}) started for {symbol or 'all articles'}", "job_id": job.id if job else None}
 
 @app.get("/api/sentiment/stock/{symbol}")
 async def get_stock_sentiment(
@@ -504,9 +552,11 @@ async def get_stock_sentiment(
     db: Session = Depends(get_db)
 ):
     """Get sentiment summary for a specific stock"""
-    service = NewsService(db)
+    service = NewsService(db, scraper=scraper)
     summary = service.get_stock_sentiment_summary(symbol, days_back)
     
+    get_refresh_scheduler().popularity.record(symbol)
+    
     return summary
 
 @app.get("/api/sentiment/articles")
@@ -523,7 +573,7 @@ async def get_articles_with_sentiment(
     )
     
     if symbol:
-        query = query.filter(NewsArticle.stock_symbol == symbol.upper())
+        query = query.filter(article_symbol_filter(symbol))
     
     if sentiment:
         query = query.filter(NewsArticle.sentiment_label == sentiment)
@@ -543,6 +593,7 @@ async def get_articles_with_sentiment(
                 "sentiment_score": article.sentiment_score,
                 "sentiment_label": article.sentiment_label,
                 "sentiment_confidence": article.sentiment_confidence,
+                "sentiment_mode": article.sentiment_mode,
                 "textblob_polarity": article.textblob_polarity,
                 "textblob_subjectivity": article.textblob_subjectivity,
                 "vader_compound": article.vader_compound,
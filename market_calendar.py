@@ -0,0 +1,101 @@
+"""
+US equity market calendar
+Regular NYSE/Nasdaq trading sessions, full-day holidays and early closes,
+computed from the exchange's rules for any year
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+MARKET_TZ = ZoneInfo('America/New_York')
+
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+# Unscheduled closures announced by the exchange, on top of the rule-based holidays
+NYSE_SPECIAL_CLOSURES = {
+    date(2025, 1, 9),
+}
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday (Monday is 0) of a month, counting from the end when n is negative"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-n - 1))
+
+def observed(day: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year: int) -> FrozenSet[date]:
+    """Full-day NYSE holidays of a year, from the exchange's holiday rules"""
+    holidays = {
+        nth_weekday(year, 1, 0, 3),
+        nth_weekday(year, 2, 0, 3),
+        easter_sunday(year) - timedelta(days=2),
+        nth_weekday(year, 5, 0, -1),
+        observed(date(year, 7, 4)),
+        nth_weekday(year, 9, 0, 1),
+        nth_weekday(year, 11, 3, 4),
+        observed(date(year, 12, 25)),
+    }
+    # A Saturday New Year's Day is not made up on the Friday before
+    if date(year, 1, 1).weekday() != 5:
+        holidays.add(observed(date(year, 1, 1)))
+    if year >= 2022:
+        holidays.add(observed(date(year, 6, 19)))
+    holidays.update(day for day in NYSE_SPECIAL_CLOSURES if day.year == year)
+    return frozenset(holidays)
+
+@lru_cache(maxsize=None)
+def nyse_early_closes(year: int) -> FrozenSet[date]:
+    """1 p.m. closes: July 3 and Christmas Eve on Monday to Thursday, and the day after Thanksgiving"""
+    early_closes = {nth_weekday(year, 11, 3, 4) + timedelta(days=1)}
+    for day in (date(year, 7, 3), date(year, 12, 24)):
+        if day.weekday() < 4:
+            early_closes.add(day)
+    return frozenset(early_closes)
+
+def market_now(now: Optional[datetime] = None) -> datetime:
+    """Current time in the market time zone, naive datetimes are taken as local time"""
+    if now is None:
+        return datetime.now(MARKET_TZ)
+    if now.tzinfo is None:
+        now = now.astimezone()
+    return now.astimezone(MARKET_TZ)
+
+def is_trading_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """Whether the regular trading session is in progress"""
+    now = market_now(now)
+    if not is_trading_day(now.date()):
+        return False
+
+    close = EARLY_CLOSE if now.date() in nyse_early_closes(now.year) else MARKET_CLOSE
+    return MARKET_OPEN <= now.time() < close
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, Float, Date
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index, Float, Date, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 
@@ -21,6 +22,7 @@ class NewsArticle(Base):
     sentiment_score = Column(Float)
     sentiment_label = Column(String(20))
     sentiment_confidence = Column(Float)
+    sentiment_mode = Column(String(20))
     textblob_polarity = Column(Float)
     textblob_subjectivity = Column(Float)
     vader_compound = Column(Float)
@@ -29,6 +31,8 @@ class NewsArticle(Base):
     vader_neutral = Column(Float)
     sentiment_analyzed_at = Column(DateTime)
     
+    symbols = relationship("NewsArticleSymbol", back_populates="article", cascade="all, delete-orphan")
+    
     __table_args__ = (
         Index('idx_stock_symbol_published', 'stock_symbol', 'published_date'),
         Index('idx_scraped_at', 'scraped_at'),
@@ -39,6 +43,43 @@ class NewsArticle(Base):
     def __repr__(self):
         return f"<NewsArticle(id={self.id}, title='{self.title[:50]}...', symbol='{self.stock_symbol}', sentiment='{self.sentiment_label}')>"
 
+class NewsArticleSymbol(Base):
+    __tablename__ = "news_article_symbols"
+    
+    article_id = Column(Integer, ForeignKey("news_articles.id", ondelete="CASCADE"), primary_key=True)
+    symbol = Column(String(10), primary_key=True)
+    
+    article = relationship("NewsArticle", back_populates="symbols")
+    
+    __table_args__ = (
+        Index('idx_article_symbols_symbol', 'symbol'),
+    )
+    
+    def __repr__(self):
+        return f"<NewsArticleSymbol(article_id={self.article_id}, symbol='{self.symbol}')>"
+
+class NewsWatermark(Base):
+    __tablename__ = "news_watermarks"
+    
+    symbol = Column(String(10), primary_key=True)
+    last_published_date = Column(DateTime)
+    last_link = Column(Text)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<NewsWatermark(symbol='{self.symbol}', last_published_date={self.last_published_date})>"
+
+class SentimentCacheEntry(Base):
+    __tablename__ = "sentiment_cache"
+    
+    key = Column(String(64), primary_key=True)
+    analyzer_version = Column(String(200), nullable=False, index=True)
+    result = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=func.now())
+    
+    def __repr__(self):
+        return f"<SentimentCacheEntry(key='{self.key[:12]}', analyzer_version='{self.analyzer_version}')>"
+
 class Stock(Base):
     __tablename__ = "stocks"
     
@@ -78,4 +119,28 @@ class Stock(Base):
     )
     
     def __repr__(self):
-        return f"<Stock(symbol='{self.symbol}', name='{self.name}', price={self.price})>"
\ No newline at end of file
+        return f"<Stock(symbol='{self.symbol}', name='{self.name}', price={self.price})>"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(Text, nullable=False, default='{}')
+    priority = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default='queued')
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime, nullable=False, default=func.now())
+    locked_by = Column(String(100))
+    last_error = Column(Text)
+    result = Column(Text)
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_jobs_dequeue', 'status', 'priority', 'run_at'),
+    )
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}', attempts={self.attempts})>"
@@ -0,0 +1,128 @@
+"""
+Date parsing for Finviz news rows
+Finviz repeats the same few timestamps and prints time-only rows under the
+first row of each day, so raw strings are memoized and the last seen date
+is carried forward within a table
+"""
+
+import re
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+
+MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
+}
+
+# Fast path for the usual "Oct-15-25 06:05PM" stamp
+FINVIZ_STAMP = re.compile(r'([A-Za-z]{3})-(\d{1,2})-(\d{2})\s+(\d{1,2}):(\d{2})\s*([AaPp][Mm])')
+
+DATE_TOKEN = re.compile(r'(?:([A-Za-z]{3})|(\d{1,2}))-(\d{1,2})(?:-(\d{2}|\d{4}))?')
+ISO_DATE_TOKEN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+TIME_TOKEN = re.compile(r'(\d{1,2}):(\d{2})\s*([AaPp][Mm])?')
+
+RELATIVE_DAYS = {'TODAY': 0, 'YESTERDAY': -1}
+
+# (year or None, month, day), year is None when the row omits it
+DateParts = Tuple[Optional[int], int, int]
+
+def _year(text: str) -> int:
+    year = int(text)
+    return year + 2000 if year < 100 else year
+
+def _clock(hour: int, minute: int, meridiem: Optional[str]) -> Optional[time]:
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.upper() == 'PM' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+@lru_cache(maxsize=1024)
+def parse_date_token(token: str) -> Optional[DateParts]:
+    """Parse "Oct-15-25", "10-15-25", "10-15" or "2025-10-15" into date parts"""
+    match = ISO_DATE_TOKEN.fullmatch(token)
+    if match:
+        return int(match.group(1)), int(match.group(2)), int(match.group(3))
+
+    match = DATE_TOKEN.fullmatch(token)
+    if not match:
+        return None
+
+    month_name, month_number, day, year = match.groups()
+    month = MONTHS.get(month_name.upper()) if month_name else int(month_number)
+    if not month or not 1 <= month <= 12:
+        return None
+    return (_year(year) if year else None), month, int(day)
+
+@lru_cache(maxsize=1024)
+def parse_time_token(token: str) -> Optional[time]:
+    """Parse "06:05PM" or "18:05" into a time"""
+    match = TIME_TOKEN.fullmatch(token)
+    if not match:
+        return None
+    return _clock(int(match.group(1)), int(match.group(2)), match.group(3))
+
+@lru_cache(maxsize=4096)
+def parse_stamp(text: str) -> Tuple[Optional[DateParts], Optional[int], Optional[time]]:
+    """
+    Split a raw news timestamp into (date parts, relative day offset, time)
+    Any part the text does not contain is None
+    """
+    match = FINVIZ_STAMP.fullmatch(text)
+    if match:
+        month_name, day, year, hour, minute, meridiem = match.groups()
+        month = MONTHS.get(month_name.upper())
+        clock = _clock(int(hour), int(minute), meridiem)
+        if month and clock:
+            return (_year(year), month, int(day)), None, clock
+
+    parts, offset, clock = None, None, None
+    for token in text.split():
+        upper = token.upper()
+        if upper in RELATIVE_DAYS:
+            offset = RELATIVE_DAYS[upper]
+        elif clock is None and ':' in token:
+            clock = parse_time_token(token)
+        elif parts is None:
+            parts = parse_date_token(token)
+
+    return parts, offset, clock
+
+class NewsDateParser:
+    """
+    Stateful parser for the rows of one news table
+
+    Rows without a date take the date of the previous dated row, and the
+    current date is read once per table rather than once per row.
+    """
+
+    def __init__(self, now: Optional[datetime] = None):
+        self.today = (now or datetime.now()).date()
+        self.current_date: Optional[date] = None
+
+    def parse(self, date_text: str, time_text: str = "") -> Optional[datetime]:
+        """Parse a row's date and time cells, carrying the date forward"""
+        text = f"{date_text} {time_text}" if time_text else date_text
+        parts, offset, clock = parse_stamp(text.strip())
+
+        day = None
+        if offset is not None:
+            day = self.today + timedelta(days=offset)
+        elif parts:
+            year, month, day_of_month = parts
+            try:
+                day = date(year or self.today.year, month, day_of_month)
+            except ValueError:
+                day = None
+
+        if day:
+            self.current_date = day
+        elif clock:
+            day = self.current_date or self.today
+        else:
+            return None
+
+        return datetime.combine(day, clock or time.min)
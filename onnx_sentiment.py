@@ -0,0 +1,126 @@
+"""
+ONNX Runtime backend for the transformer sentiment scorer
+Exports the Hugging Face model to ONNX once, quantizes its weights to int8
+with dynamic quantization and scores text with onnxruntime on CPU, without
+loading torch at inference time
+
+Accuracy: dynamic int8 quantization changes the class probabilities
+slightly. Scores are accepted when every class probability is within
+SCORE_TOLERANCE (absolute) of the torch pipeline and the top label agrees on
+at least LABEL_AGREEMENT of the texts; scripts/benchmark_sentiment.py checks
+both on the headline sample it benchmarks.
+"""
+
+import os
+import json
+import logging
+from typing import Dict, List, Union
+
+import numpy as np
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+SCORE_TOLERANCE = 0.05
+LABEL_AGREEMENT = 0.97
+
+MAX_LENGTH = 512
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+def model_dir(model_name: str, base_dir: str = None) -> str:
+    """Directory holding the exported model, tokenizer and config for model_name"""
+    return os.path.join(base_dir or Config.SENTIMENT_ONNX_DIR, model_name.replace('/', '__'))
+
+def export_quantized_model(model_name: str, output_dir: str) -> str:
+    """
+    Export model_name to ONNX and write a dynamically int8 quantized copy
+    Needs torch and transformers; only run once per model
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    sample = tokenizer(["Shares rise after earnings beat"], return_tensors='pt')
+    fp32_path = os.path.join(output_dir, FP32_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample['input_ids'], sample['attention_mask']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'logits': {0: 'batch'}
+            },
+            opset_version=14
+        )
+
+    int8_path = os.path.join(output_dir, INT8_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    logger.info(f"Exported {model_name} to {int8_path}")
+    return int8_path
+
+class OnnxSentimentPipeline:
+    """
+    Drop-in replacement for a transformers sentiment pipeline created with
+    return_all_scores=True: called with a string or a list of strings, it
+    returns one list of {'label', 'score'} dicts per text
+    """
+
+    def __init__(self, directory: str, threads: int = None):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        with open(os.path.join(directory, 'config.json')) as f:
+            id2label = json.load(f)['id2label']
+        self.labels = [id2label[str(index)] for index in range(len(id2label))]
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads or Config.SENTIMENT_ONNX_THREADS
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(directory, INT8_FILE), options, providers=['CPUExecutionProvider']
+        )
+
+    def __call__(self, texts: Union[str, List[str]], batch_size: int = None, truncation: bool = True,
+                 **kwargs) -> List[List[Dict]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        batch_size = batch_size or len(texts) or 1
+
+        results = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            # Pads to the longest text in the batch only
+            encoded = self.tokenizer(batch, padding=True, truncation=truncation, max_length=MAX_LENGTH, return_tensors='np')
+            logits = self.session.run(['logits'], {
+                'input_ids': encoded['input_ids'].astype(np.int64),
+                'attention_mask': encoded['attention_mask'].astype(np.int64)
+            })[0]
+
+            shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities = shifted / shifted.sum(axis=1, keepdims=True)
+            for row in probabilities:
+                results.append([{'label': label, 'score': float(score)} for label, score in zip(self.labels, row)])
+
+        return results
+
+def load_onnx_pipeline(model_name: str, base_dir: str = None) -> OnnxSentimentPipeline:
+    """Load the quantized model for model_name, exporting it first when missing"""
+    directory = model_dir(model_name, base_dir)
+    if not os.path.exists(os.path.join(directory, INT8_FILE)):
+        export_quantized_model(model_name, directory)
+    return OnnxSentimentPipeline(directory)
@@ -0,0 +1,171 @@
+"""
+Bulk quote page pipeline
+Fetcher threads push raw page bytes onto a bounded queue while a process
+pool parses them, so network I/O overlaps with parsing on every core
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import Config
+from scraper import FinvizScraper
+
+logger = logging.getLogger(__name__)
+
+_worker_scrapers: Dict[Tuple[str, str], FinvizScraper] = {}
+
+def _parse_in_worker(symbol: str, content: bytes, watermark: Optional[Dict],
+                     parser_backend: str, base_url: str) -> Tuple[str, Dict]:
+    """Parse with one scraper per backend and base URL, built once per worker process"""
+    scraper = _worker_scrapers.get((parser_backend, base_url))
+    if scraper is None:
+        scraper = FinvizScraper(parser_backend=parser_backend)
+        scraper.base_url = base_url
+        _worker_scrapers[(parser_backend, base_url)] = scraper
+    return symbol, scraper.parse_quote_page(content, symbol, watermark)
+
+def empty_quote() -> Dict:
+    return {'stock': None, 'news': []}
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process-wide quote parsing pool, worker processes start on first use"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=Config.PARSE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _parse_pool
+
+def discard_parse_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next get_parse_pool starts fresh workers"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def close_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=True, cancel_futures=True)
+            _parse_pool = None
+
+class QuotePipeline:
+    """
+    Fetch quote pages on threads and parse them in worker processes
+
+    Results are streamed back in completion order as (symbol, quote)
+    pairs with the same shape as FinvizScraper.scrape_quote.
+    """
+
+    def __init__(self, scraper: Optional[FinvizScraper] = None,
+                 fetch_workers: Optional[int] = None,
+                 parse_workers: Optional[int] = None,
+                 queue_size: Optional[int] = None):
+        self.scraper = scraper or FinvizScraper()
+        self.fetch_workers = fetch_workers or Config.SCRAPER_CONCURRENCY
+        self.parse_workers = parse_workers or Config.PARSE_WORKERS
+        self.queue_size = queue_size or Config.PARSE_QUEUE_SIZE
+
+    def _fetch_into(self, raw_queue: queue.Queue, stop: threading.Event, symbol: str):
+        try:
+            content = self.scraper._fetch_quote_page(symbol)
+        except Exception as e:
+            logger.warning(f"Failed to fetch quote page for {symbol}: {e}")
+            content = None
+
+        while not stop.is_set():
+            try:
+                raw_queue.put((symbol, content), timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def iter_quotes(self, symbols: List[str], watermarks: Optional[Dict[str, Dict]] = None) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield (symbol, quote) pairs as soon as each page is parsed
+        News parsing stops at each symbol's watermark when one is given
+        """
+        if not symbols:
+            return
+
+        watermarks = watermarks or {}
+
+        raw_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        max_pending = self.parse_workers * 2
+        parse_args = (self.scraper.parser_backend, self.scraper.base_url)
+        pending = {}
+
+        fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers)
+
+        try:
+            for symbol in symbols:
+                fetch_pool.submit(self._fetch_into, raw_queue, stop, symbol)
+
+            remaining = len(symbols)
+
+            while remaining or pending:
+                can_accept = remaining and len(pending) < max_pending
+
+                if can_accept:
+                    try:
+                        symbol, content = raw_queue.get(timeout=0.05 if pending else None)
+                    except queue.Empty:
+                        symbol, content = None, None
+
+                    if symbol is not None:
+                        remaining -= 1
+                        if content is None:
+                            yield symbol, empty_quote()
+                        else:
+                            args = (_parse_in_worker, symbol, content, watermarks.get(symbol.upper()), *parse_args)
+                            parse_pool = get_parse_pool()
+                            try:
+                                future = parse_pool.submit(*args)
+                            except BrokenProcessPool:
+                                discard_parse_pool(parse_pool)
+                                parse_pool = get_parse_pool()
+                                future = parse_pool.submit(*args)
+                            pending[future] = (symbol, parse_pool)
+                        continue
+
+                if not pending:
+                    continue
+
+                done, _ = wait(pending, timeout=0 if can_accept else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol, parse_pool = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"Quote parse worker failed for {symbol}: {e}")
+                        if isinstance(e, BrokenProcessPool):
+                            discard_parse_pool(parse_pool)
+                        result = symbol, empty_quote()
+                    yield result
+        finally:
+            stop.set()
+            for future in pending:
+                future.cancel()
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+
+    def iter_news(self, symbols: List[str], watermarks: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+        """Stream the news articles of every symbol, newest first within each symbol"""
+        for _, quote in self.iter_quotes(symbols, watermarks):
+            yield from quote['news']
+
+    def scrape_quotes(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Collect every quote into a dictionary keyed by symbol"""
+        return dict(self.iter_quotes(symbols))
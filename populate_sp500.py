@@ -10,7 +10,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from database import SessionLocal, create_tables, test_connection
 from models import Stock
-from sp500_data import get_sp500_companies
+from symbol_registry import symbol_registry
 from datetime import datetime
 
 def populate_sp500():
@@ -25,7 +25,7 @@ def populate_sp500():
     create_tables()
     
     
-    companies = get_sp500_companies()
+    companies = symbol_registry.companies()
     
     db = SessionLocal()
     
@@ -0,0 +1,176 @@
+"""
+Process-wide adaptive rate limiter for upstream requests
+Token bucket whose refill rate follows AIMD: it creeps up while requests
+succeed and is cut multiplicatively on 429/503 responses
+"""
+
+import threading
+import time
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUS_CODES = (429, 503)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket with an AIMD-controlled refill rate
+    """
+
+    def __init__(self, rate: float, min_rate: float, max_rate: float, burst: int,
+                 increase_step: float = 0.05, decrease_factor: float = 0.5,
+                 clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.clock = clock
+
+        self._tokens = float(burst)
+        self._last_refill = clock()
+        self._blocked_until = 0.0
+        self._waiting = 0
+        self._throttled_count = 0
+        self._request_count = 0
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a request may be sent, returning False on timeout"""
+        deadline = None if timeout is None else self.clock() + timeout
+
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    now = self.clock()
+                    self._refill(now)
+
+                    if now >= self._blocked_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        self._request_count += 1
+                        return True
+
+                    if now < self._blocked_until:
+                        wait = self._blocked_until - now
+                    else:
+                        wait = (1 - self._tokens) / self.rate
+
+                    if deadline is not None:
+                        if now >= deadline:
+                            return False
+                        wait = min(wait, deadline - now)
+
+                    self._cond.wait(wait)
+            finally:
+                self._waiting -= 1
+
+    def on_success(self):
+        """Additive increase after a request that was not throttled"""
+        with self._cond:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Multiplicative decrease, pausing all requests for retry_after seconds"""
+        with self._cond:
+            self._throttled_count += 1
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            self._tokens = 0.0
+
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, self.clock() + retry_after)
+
+            logger.warning(f"Upstream throttled, rate lowered to {self.rate:.2f} req/s")
+            self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """Current rate, available tokens and number of waiting requests"""
+        with self._cond:
+            self._refill(self.clock())
+            return {
+                'rate': round(self.rate, 3),
+                'min_rate': self.min_rate,
+                'max_rate': self.max_rate,
+                'tokens': round(self._tokens, 3),
+                'queue_depth': self._waiting,
+                'blocked_for': round(max(0.0, self._blocked_until - self.clock()), 3),
+                'requests': self._request_count,
+                'throttled': self._throttled_count
+            }
+
+class RateLimitedHTTPAdapter(HTTPAdapter):
+    """
+    Transport adapter that takes a token before every upstream request
+    and retries throttled responses after the advertised Retry-After
+    """
+
+    def __init__(self, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 throttle_retries: Optional[int] = None, **kwargs):
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.throttle_retries = Config.SCRAPER_THROTTLE_RETRIES if throttle_retries is None else throttle_retries
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = super().send(request, **kwargs)
+
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                self.rate_limiter.on_success()
+                return response
+
+            self.rate_limiter.on_throttle(parse_retry_after(response.headers.get('Retry-After')))
+
+            if attempt >= self.throttle_retries:
+                return response
+
+            attempt += 1
+            response.close()
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Process-wide rate limiter shared by every scraper"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = AdaptiveRateLimiter(
+                rate=Config.SCRAPER_RATE,
+                min_rate=Config.SCRAPER_MIN_RATE,
+                max_rate=Config.SCRAPER_MAX_RATE,
+                burst=Config.SCRAPER_BURST
+            )
+        return _rate_limiter
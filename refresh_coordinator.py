@@ -0,0 +1,136 @@
+"""
+Freshness-gated background refresh of stock quotes and news
+Read endpoints ask the coordinator to refresh what they served; upstream
+work only happens for stale symbols, at most once at a time per symbol
+"""
+
+import threading
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from fastapi import BackgroundTasks
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import Config
+from database import SessionLocal
+from models import NewsArticle, Stock
+from scraper import FinvizScraper
+from services import StockService
+
+logger = logging.getLogger(__name__)
+
+class RefreshCoordinator:
+    """
+    Decides which symbols need a rescrape and runs each refresh once
+
+    A symbol is fresh while its stock row or newest scraped article is
+    younger than the TTL. Concurrent requests for the same symbol share one
+    in-flight refresh, and symbols whose quote page was fetched but has no
+    data are not retried until the negative TTL expires. Failed fetches are
+    never negative-cached.
+    """
+
+    def __init__(self, scraper: Optional[FinvizScraper] = None,
+                 session_factory: Callable[[], Session] = SessionLocal,
+                 ttl: Optional[int] = None,
+                 negative_ttl: Optional[int] = None):
+        self.scraper = scraper or FinvizScraper()
+        self.session_factory = session_factory
+        self.ttl = Config.REFRESH_TTL if ttl is None else ttl
+        self.negative_ttl = Config.REFRESH_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, float] = {}
+        self._negative: Dict[str, float] = {}
+        self._counts = {'scheduled': 0, 'coalesced': 0, 'fresh': 0, 'negative': 0}
+
+    def stale_symbols(self, db: Session, symbols: List[str]) -> List[str]:
+        """Symbols whose newest stock update and scraped article are older than the TTL"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not symbols:
+            return []
+
+        last_refreshed: Dict[str, datetime] = {}
+        for symbol, updated_at in db.query(Stock.symbol, Stock.updated_at).filter(Stock.symbol.in_(symbols)):
+            if updated_at:
+                last_refreshed[symbol] = updated_at
+
+        for symbol, scraped_at in db.query(
+            NewsArticle.stock_symbol, func.max(NewsArticle.scraped_at)
+        ).filter(NewsArticle.stock_symbol.in_(symbols)).group_by(NewsArticle.stock_symbol):
+            if scraped_at and (symbol not in last_refreshed or scraped_at > last_refreshed[symbol]):
+                last_refreshed[symbol] = scraped_at
+
+        cutoff = datetime.now() - timedelta(seconds=self.ttl)
+        return [symbol for symbol in symbols if symbol not in last_refreshed or last_refreshed[symbol] < cutoff]
+
+    def claim(self, symbol: str) -> bool:
+        """Mark a symbol as being refreshed unless it already is or is negative-cached"""
+        now = time.time()
+        with self._lock:
+            if self._negative.get(symbol, 0) > now:
+                self._counts['negative'] += 1
+                return False
+            if symbol in self._inflight:
+                self._counts['coalesced'] += 1
+                return False
+            self._inflight[symbol] = now
+            self._counts['scheduled'] += 1
+            return True
+
+    def schedule(self, background_tasks: BackgroundTasks, db: Session, symbols: List[str],
+                 limit: Optional[int] = None) -> List[str]:
+        """Queue background refreshes for the stale symbols among symbols, returning those queued"""
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        stale = self.stale_symbols(db, symbols)
+
+        with self._lock:
+            self._counts['fresh'] += len(symbols) - len(stale)
+
+        scheduled = []
+        for symbol in stale:
+            if limit is not None and len(scheduled) >= limit:
+                break
+            if self.claim(symbol):
+                background_tasks.add_task(self.refresh, symbol)
+                scheduled.append(symbol)
+
+        return scheduled
+
+    def refresh(self, symbol: str) -> Dict:
+        """Rescrape a claimed symbol on its own database session"""
+        db = self.session_factory()
+        try:
+            result = StockService(db, scraper=self.scraper).scrape_and_save_quote(symbol)
+            if not result.get('stock_updated') and 'error' not in result:
+                with self._lock:
+                    self._negative[symbol] = time.time() + self.negative_ttl
+                logger.info(f"No quote data for {symbol}, not retrying for {self.negative_ttl}s")
+            return result
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight.pop(symbol, None)
+
+    def stats(self) -> Dict:
+        now = time.time()
+        with self._lock:
+            return {
+                'inflight': sorted(self._inflight),
+                'negative_cached': sorted(symbol for symbol, until in self._negative.items() if until > now),
+                **self._counts
+            }
+
+_refresh_coordinator = None
+_refresh_coordinator_lock = threading.Lock()
+
+def get_refresh_coordinator() -> RefreshCoordinator:
+    """Process-wide refresh coordinator shared by every endpoint"""
+    global _refresh_coordinator
+    with _refresh_coordinator_lock:
+        if _refresh_coordinator is None:
+            _refresh_coordinator = RefreshCoordinator()
+        return _refresh_coordinator
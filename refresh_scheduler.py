@@ -0,0 +1,169 @@
+"""
+Background refresh scheduler
+Continuously spends a fixed upstream request budget on the symbols that
+are most overdue, weighted by how often users look at them and by whether
+the US market is open
+"""
+
+import math
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from database import SessionLocal
+from market_calendar import is_market_open
+from models import Stock
+from rate_limiter import get_rate_limiter
+from refresh_coordinator import RefreshCoordinator, get_refresh_coordinator
+
+logger = logging.getLogger(__name__)
+
+class PopularityTracker:
+    """
+    Exponentially decaying per-symbol view counts
+    """
+
+    def __init__(self, half_life: Optional[float] = None):
+        self.half_life = half_life or Config.SCHEDULER_POPULARITY_HALF_LIFE
+        self._lock = threading.Lock()
+        self._scores: Dict[str, Tuple[float, float]] = {}
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def record(self, symbol: str, weight: float = 1.0):
+        now = time.time()
+        symbol = symbol.upper()
+        with self._lock:
+            score, updated = self._scores.get(symbol, (0.0, now))
+            self._scores[symbol] = (self._decayed(score, updated, now) + weight, now)
+
+    def scores(self) -> Dict[str, float]:
+        now = time.time()
+        with self._lock:
+            return {symbol: self._decayed(score, updated, now) for symbol, (score, updated) in self._scores.items()}
+
+def rank_symbols(last_refreshed: Dict[str, Optional[datetime]], popularity: Dict[str, float],
+                 now: datetime, target_age: float) -> List[Tuple[str, float]]:
+    """
+    Order symbols by refresh priority, highest first
+
+    A symbol's score is its age over the target age, boosted by the log of
+    its popularity. Only symbols with a score of at least 1 are returned;
+    never refreshed symbols are always due.
+    """
+    ranked = []
+    for symbol, refreshed_at in last_refreshed.items():
+        boost = 1 + math.log1p(popularity.get(symbol, 0.0))
+        if refreshed_at is None:
+            score = math.inf
+        else:
+            score = (now - refreshed_at).total_seconds() / target_age * boost
+        if score >= 1:
+            ranked.append((symbol, score))
+
+    ranked.sort(key=lambda item: (-item[1], item[0]))
+    return ranked
+
+class RefreshScheduler:
+    """
+    Periodically refreshes the highest ranked symbols through the refresh
+    coordinator, within a per-minute upstream request budget
+    """
+
+    def __init__(self, coordinator: Optional[RefreshCoordinator] = None,
+                 popularity: Optional[PopularityTracker] = None,
+                 interval: Optional[float] = None,
+                 budget_per_minute: Optional[int] = None):
+        self.coordinator = coordinator or get_refresh_coordinator()
+        self.popularity = popularity or PopularityTracker()
+        self.interval = interval or Config.SCHEDULER_INTERVAL
+        self.budget_per_minute = budget_per_minute or Config.SCHEDULER_REQUEST_BUDGET
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {'ticks': 0, 'refreshed': 0, 'skipped_throttled': 0, 'last_due': 0, 'market_open': False}
+
+    def target_age(self, now: Optional[datetime] = None) -> float:
+        """Desired maximum data age in seconds, longer while the market is closed"""
+        return Config.SCHEDULER_MARKET_TTL if is_market_open(now) else Config.SCHEDULER_CLOSED_TTL
+
+    def due_symbols(self, db) -> List[str]:
+        last_refreshed = {symbol: updated_at for symbol, updated_at in db.query(Stock.symbol, Stock.updated_at)}
+        now = datetime.now()
+        ranked = rank_symbols(last_refreshed, self.popularity.scores(), now, self.target_age(now))
+        return [symbol for symbol, _ in ranked]
+
+    def tick(self) -> int:
+        """Refresh the most overdue symbols this interval's budget allows"""
+        self._stats['ticks'] += 1
+        self._stats['market_open'] = is_market_open()
+
+        if get_rate_limiter().stats()['blocked_for'] > 0:
+            self._stats['skipped_throttled'] += 1
+            return 0
+
+        budget = max(1, int(self.budget_per_minute * self.interval / 60))
+
+        db = SessionLocal()
+        try:
+            due = self.due_symbols(db)
+        finally:
+            db.close()
+        self._stats['last_due'] = len(due)
+
+        refreshed = 0
+        for symbol in due:
+            if refreshed >= budget or self._stop.is_set():
+                break
+            if self.coordinator.claim(symbol):
+                self.coordinator.refresh(symbol)
+                refreshed += 1
+
+        self._stats['refreshed'] += refreshed
+        return refreshed
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"Refresh scheduler tick failed: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+        logger.info(f"Refresh scheduler started, {self.budget_per_minute} requests/min every {self.interval}s")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+
+    def stats(self) -> Dict:
+        popular = sorted(self.popularity.scores().items(), key=lambda item: -item[1])[:10]
+        return {
+            **self._stats,
+            'running': bool(self._thread and self._thread.is_alive()),
+            'budget_per_minute': self.budget_per_minute,
+            'top_popular': [{'symbol': symbol, 'score': round(score, 2)} for symbol, score in popular]
+        }
+
+_refresh_scheduler = None
+_refresh_scheduler_lock = threading.Lock()
+
+def get_refresh_scheduler() -> RefreshScheduler:
+    """Process-wide scheduler, also the place read endpoints report views to"""
+    global _refresh_scheduler
+    with _refresh_scheduler_lock:
+        if _refresh_scheduler is None:
+            _refresh_scheduler = RefreshScheduler()
+        return _refresh_scheduler
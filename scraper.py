@@ -1,225 +1,264 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from datetime import datetime, date
-import time
 import re
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from urllib.parse import urljoin, urlparse
 import logging
 
+from config import Config
+from http_client import get_session
+from news_dates import NewsDateParser
+from symbol_registry import symbol_registry
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class FinvizScraper:
+PARSER_BACKENDS = ('html.parser', 'lxml', 'strainer')
+
+QUOTE_TABLE_CLASSES = re.compile(r'news|snapshot-table2')
+
+class QuoteTablesStrainer(SoupStrainer):
+    """
+    Keeps the tables _find_news_table and _extract_stock_data look for: a class
+    mentioning news or snapshot-table2, or the news-table id. SoupStrainer
+    attributes must all match, so the id alternative needs its own check
+    """
+    
     def __init__(self):
-        self.base_url = "https://finviz.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        super().__init__('table')
     
-    def get_news_for_stock(self, symbol: str, max_pages: int = 5) -> List[Dict]:
+    @staticmethod
+    def is_quote_table(name: str, attrs) -> bool:
+        if name != 'table' or not attrs:
+            return False
+        if attrs.get('id') == 'news-table':
+            return True
+        classes = attrs.get('class') or ''
+        if not isinstance(classes, str):
+            classes = ' '.join(classes)
+        return bool(QUOTE_TABLE_CLASSES.search(classes))
+    
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        """Parse-time filter on beautifulsoup4 4.13 and later"""
+        return self.is_quote_table(name, attrs)
+    
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        """Parse-time filter on beautifulsoup4 before 4.13"""
+        if markup_name is not None and not isinstance(markup_name, str):
+            return super().search_tag(markup_name, markup_attrs)
+        return markup_name if self.is_quote_table(markup_name, markup_attrs) else None
+
+QUOTE_TABLES_STRAINER = QuoteTablesStrainer()
+
+class FinvizScraper:
+    def __init__(self, parser_backend: Optional[str] = None):
+        self.parser_backend = parser_backend or Config.SCRAPER_PARSER
+        if self.parser_backend not in PARSER_BACKENDS:
+            raise ValueError(f"Unknown parser backend '{self.parser_backend}', expected one of: {', '.join(PARSER_BACKENDS)}")
+        
+        self.base_url = Config.FINVIZ_BASE_URL
+    
+    @property
+    def session(self) -> requests.Session:
+        """Thread-local session on the process-wide connection pool"""
+        return get_session()
+    
+    def get_news_for_stock(self, symbol: str, max_pages: int = 5, watermark: Optional[Dict] = None) -> List[Dict]:
         """
         Scrape news articles for a specific stock symbol from Finviz
         
         Args:
             symbol: Stock symbol (e.g., 'AAPL', 'TSLA')
             max_pages: Maximum number of pages to scrape (default: 5)
+            watermark: Newest article already stored for the symbol, parsing
+                stops at the first row at or behind it
         
         Returns:
-            List of dictionaries containing article information
+            List of dictionaries containing article information, newest first
         """
-        articles = []
+        try:
+            content = self._fetch_quote_page(symbol)
+        except requests.RequestException as e:
+            return []
         
+        return self.parse_news_page(content, symbol, watermark)
+    
+    def iter_news_for_stock(self, symbol: str, watermark: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Stream the relevant news articles of a stock as its news table is parsed
+        Same articles and order as get_news_for_stock, without building the list
+        """
         try:
-            news_url = f"{self.base_url}/quote.ashx?t={symbol.upper()}"
-            
-            
-            response = self.session.get(news_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            news_table = soup.find('table', class_='body-table-news-wrapper news-table_wrapper')
-            
-            if not news_table:
-                news_table = soup.find('table', {'id': 'news-table'})
-                
-            if not news_table:
-                news_table = soup.find('table', class_=re.compile(r'news', re.I))
-                if not news_table:
-                    news_table = soup.find('table')
-                    if news_table:
-                        news_links = news_table.find_all('a', href=re.compile(r'http'))
-                        if len(news_links) < 3:
-                            news_table = None
+            content = self._fetch_quote_page(symbol)
+        except requests.RequestException as e:
+            return
+        
+        yield from self._iter_news(self._make_soup(content), symbol, watermark)
+    
+    def iter_news_for_symbols(self, symbols: List[str], watermarks: Optional[Dict[str, Dict]] = None) -> Iterator[Dict]:
+        """Stream the news of several stocks one symbol after another"""
+        watermarks = watermarks or {}
+        for symbol in symbols:
+            yield from self.iter_news_for_stock(symbol, watermarks.get(symbol.upper()))
+    
+    def quote_url(self, symbol: str) -> str:
+        """Build the Finviz quote page URL for a symbol"""
+        return f"{self.base_url}/quote.ashx?t={symbol.upper()}"
+    
+    def _fetch(self, url: str) -> bytes:
+        """GET a page and return the raw response body"""
+        response = self.session.get(url, timeout=Config.HTTP_TIMEOUT)
+        response.raise_for_status()
+        return response.content
+    
+    def _fetch_quote_page(self, symbol: str) -> bytes:
+        """Download the raw HTML of the quote page for a symbol"""
+        return self._fetch(self.quote_url(symbol))
+    
+    def scrape_quote(self, symbol: str, watermark: Optional[Dict] = None) -> Dict:
+        """
+        Scrape fundamentals and news for a stock with a single page fetch
+        
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL', 'TSLA')
+            watermark: Newest article already stored for the symbol
+        
+        Returns:
+            Dictionary with 'stock' (stock data dict or None) and 'news' (list of articles),
+            plus 'error' when the page could not be fetched
+        """
+        try:
+            content = self._fetch_quote_page(symbol)
+        except requests.RequestException as e:
+            return {'stock': None, 'news': [], 'error': str(e)}
+        
+        return self.parse_quote_page(content, symbol, watermark)
+    
+    def _make_soup(self, content: bytes) -> BeautifulSoup:
+        """
+        Build the parse tree of a quote page with the configured backend
+        
+        'html.parser' and 'lxml' build the full document tree. 'strainer' uses
+        lxml but only keeps the news and snapshot tables, falling back to a
+        full parse when the page layout doesn't match.
+        """
+        if self.parser_backend == 'strainer':
+            soup = BeautifulSoup(content, 'lxml', parse_only=QUOTE_TABLES_STRAINER)
+            if soup.find('table'):
+                return soup
+            return BeautifulSoup(content, 'lxml')
+        
+        return BeautifulSoup(content, self.parser_backend)
+    
+    def parse_quote_page(self, content: bytes, symbol: str, watermark: Optional[Dict] = None) -> Dict:
+        """Parse an already downloaded quote page once for both fundamentals and news"""
+        soup = self._make_soup(content)
+        
+        return {
+            'stock': self._extract_stock_data(soup, symbol),
+            'news': self._extract_news(soup, symbol, watermark)
+        }
+    
+    def parse_news_page(self, content: bytes, symbol: str, watermark: Optional[Dict] = None) -> List[Dict]:
+        """
+        Parse and filter the news table of an already downloaded quote page
+        
+        Args:
+            content: Raw HTML of the quote page
+            symbol: Stock symbol the page belongs to
+            watermark: Newest article already stored for the symbol
+        
+        Returns:
+            List of dictionaries containing article information
+        """
+        return self._extract_news(self._make_soup(content), symbol, watermark)
+    
+    def _is_seen(self, article: Dict, watermark: Dict) -> bool:
+        """Whether a news row is at or behind the watermark"""
+        if article['link'] == watermark.get('last_link'):
+            return True
+        
+        last_published = watermark.get('last_published_date')
+        published = article.get('published_date')
+        return bool(last_published and published and published < last_published)
+    
+    def _extract_news(self, soup: BeautifulSoup, symbol: str, watermark: Optional[Dict] = None) -> List[Dict]:
+        """Extract the news rows relevant to symbol from a parsed quote page"""
+        return list(self._iter_news(soup, symbol, watermark))
+    
+    def _find_news_table(self, soup: BeautifulSoup):
+        news_table = soup.find('table', class_='body-table-news-wrapper news-table_wrapper')
+        
+        if not news_table:
+            news_table = soup.find('table', {'id': 'news-table'})
             
+        if not news_table:
+            news_table = soup.find('table', class_=re.compile(r'news', re.I))
             if not news_table:
-                return articles
-            
-            rows = news_table.find_all('tr')
-            
-            for row in rows:
-                try:
-                    article_data = self._parse_news_row(row, symbol)
-                    if article_data:
-                        articles.append(article_data)
-                except Exception as e:
-                    continue
-            
-            
-            seen_links = set()
-            unique_articles = []
-            symbol_upper = symbol.upper()
-            
-            search_terms = [symbol_upper]
-            
-            company_names = {
-                'AAPL': ['APPLE'],
-                'MSFT': ['MICROSOFT'],
-                'GOOGL': ['GOOGLE', 'ALPHABET'],
-                'AMZN': ['AMAZON'],
-                'TSLA': ['TESLA'],
-                'META': ['FACEBOOK', 'META'],
-                'NVDA': ['NVIDIA'],
-                'NFLX': ['NETFLIX'],
-                'AMD': ['ADVANCED MICRO DEVICES'],
-                'INTC': ['INTEL'],
-                'CRM': ['SALESFORCE'],
-                'ORCL': ['ORACLE'],
-                'ADBE': ['ADOBE'],
-                'PYPL': ['PAYPAL'],
-                'UBER': ['UBER'],
-                'LYFT': ['LYFT'],
-                'SQ': ['SQUARE', 'BLOCK'],
-                'ROKU': ['ROKU'],
-                'ZM': ['ZOOM'],
-                'DOCU': ['DOCUSIGN'],
-                'SNOW': ['SNOWFLAKE'],
-                'PLTR': ['PALANTIR'],
-                'COIN': ['COINBASE'],
-                'HOOD': ['ROBINHOOD'],
-                'SPOT': ['SPOTIFY'],
-                'TWTR': ['TWITTER'],
-                'SNAP': ['SNAPCHAT'],
-                'PINS': ['PINTEREST'],
-                'SHOP': ['SHOPIFY'],
-                'ABNB': ['AIRBNB'],
-                'DDOG': ['DATADOG'],
-                'NET': ['CLOUDFLARE'],
-                'OKTA': ['OKTA'],
-                'CRWD': ['CROWDSTRIKE'],
-                'ZS': ['ZSCALER'],
-                'PANW': ['PALO ALTO'],
-                'FTNT': ['FORTINET'],
-                'CHKP': ['CHECK POINT'],
-                'CYBR': ['CYBERARK'],
-                'SAIL': ['SAILPOINT'],
-                'ESTC': ['ELASTIC'],
-                'MDB': ['MONGODB'],
-                'DIS': ['DISNEY'],
-                'NKE': ['NIKE'],
-                'SBUX': ['STARBUCKS'],
-                'MCD': ['MCDONALDS'],
-                'KO': ['COCA COLA'],
-                'PEP': ['PEPSICO'],
-                'WMT': ['WALMART'],
-                'TGT': ['TARGET'],
-                'HD': ['HOME DEPOT'],
-                'LOW': ['LOWES'],
-                'COST': ['COSTCO'],
-                'AMAT': ['APPLIED MATERIALS'],
-                'LRCX': ['LAM RESEARCH'],
-                'KLAC': ['KLA'],
-                'MU': ['MICRON'],
-                'QCOM': ['QUALCOMM'],
-                'AVGO': ['BROADCOM'],
-                'TXN': ['TEXAS INSTRUMENTS'],
-                'ADI': ['ANALOG DEVICES'],
-                'MRVL': ['MARVELL'],
-                'SWKS': ['SKYWORKS'],
-                'QRVO': ['QORVO'],
-                'CRUS': ['CIRRUS LOGIC'],
-                'SLAB': ['SILICON LABS'],
-                'MCHP': ['MICROCHIP'],
-                'ON': ['ON SEMICONDUCTOR'],
-                'MPWR': ['MONOLITHIC POWER'],
-                'POWI': ['POWER INTEGRATIONS'],
-                'DIOD': ['DIODES'],
-                'ALGM': ['ALLEGRO'],
-                'IMOS': ['CHIPMOS'],
-                'UMC': ['UNITED MICROELECTRONICS'],
-                'TSM': ['TAIWAN SEMICONDUCTOR'],
-                'ASML': ['ASML'],
-                'NXPI': ['NXP'],
-                'STM': ['ST MICROELECTRONICS'],
-                'INFN': ['INFINERA'],
-                'LITE': ['LUMENTUM'],
-                'ACIA': ['ACACIA'],
-                'COHR': ['COHERENT'],
-                'IIVI': ['II VI'],
-                'NPTN': ['NEOPHOTONICS'],
-                'AAOI': ['APPLIED OPTOELECTRONICS'],
-                'OCCL': ['OPTICAL CABLE'],
-                'EMAN': ['EMANATION'],
-                'FNSR': ['FINISAR'],
-                'OCLR': ['OCLARO'],
-                'PXLW': ['PIXELWORKS'],
-                'RPXC': ['RPX'],
-                'SMTC': ['SEMTECH'],
-                'SITM': ['SITIME'],
-                'SYNA': ['SYNAPTICS'],
-                'XLNX': ['XILINX']
-            }
-            
-            if symbol_upper in company_names:
-                search_terms.extend(company_names[symbol_upper])
-            
-            for article in articles:
-                if article['link'] not in seen_links:
-                    title = article.get('title', '')
-                    
-                    headline = title.split(' - ')[0].split(' | ')[0].split(' :: ')[0].split(' ... ')[0]
-                    headline = headline.split(' (')[0].split(' [')[0].split(' {')[0]
-                    headline_upper = headline.upper()
-                    
-                    import re
-                    found_match = False
-                    for term in search_terms:
-                        pattern = r'\b' + re.escape(term) + r'\b'
-                        if re.search(pattern, headline_upper):
-                            found_match = True
-                            break
-                    
-                    if found_match:
-                        seen_links.add(article['link'])
-                        unique_articles.append(article)
-                    else:
-                        continue
-            
-            return unique_articles
-            
-        except requests.RequestException as e:
-            return articles
+                news_table = soup.find('table')
+                if news_table:
+                    news_links = news_table.find_all('a', href=re.compile(r'http'))
+                    if len(news_links) < 3:
+                        news_table = None
+        
+        return news_table
+    
+    def _iter_news(self, soup: BeautifulSoup, symbol: str, watermark: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Yield the news rows relevant to symbol one at a time, newest first
+        Rows are deduplicated by link and filtered by headline as they are
+        parsed, stopping at the first row at or behind the watermark
+        """
+        try:
+            news_table = self._find_news_table(soup)
         except Exception as e:
-
-            pass
-            return articles
+            return
+        
+        if not news_table:
+            return
+        
+        date_parser = NewsDateParser()
+        seen_links = set()
+        matcher = symbol_registry.matcher(symbol.upper())
+        
+        for row in news_table.find_all('tr'):
+            try:
+                article = self._parse_news_row(row, symbol, date_parser)
+            except Exception as e:
+                continue
+            
+            if not article:
+                continue
+            if watermark and self._is_seen(article, watermark):
+                break
+            if article['link'] in seen_links:
+                continue
+            
+            title = article.get('title', '')
+            
+            headline = title.split(' - ')[0].split(' | ')[0].split(' :: ')[0].split(' ... ')[0]
+            headline = headline.split(' (')[0].split(' [')[0].split(' {')[0]
+            
+            if matcher.search(headline.upper()):
+                seen_links.add(article['link'])
+                yield article
     
-    def _parse_news_row(self, row, symbol: str) -> Optional[Dict]:
-        """Parse a single news row from the news table"""
+    def _parse_news_row(self, row, symbol: str, date_parser: Optional[NewsDateParser] = None) -> Optional[Dict]:
+        """
+        Parse a single news row from the news table
+        Rows are either [timestamp, title] or [date, time, title], time-only
+        timestamps take their date from the previous row via date_parser
+        """
         try:
             cells = row.find_all('td')
             if len(cells) < 2:
                 return None
             
-            date_cell = cells[0]
-            time_cell = cells[1] if len(cells) > 1 else None
+            date_text = cells[0].get_text(strip=True)
+            time_text = cells[1].get_text(strip=True) if len(cells) > 2 else ""
             
-            date_text = date_cell.get_text(strip=True)
-            time_text = time_cell.get_text(strip=True) if time_cell else ""
-            
-            published_date = self._parse_datetime(date_text, time_text)
+            published_date = (date_parser or NewsDateParser()).parse(date_text, time_text)
             
             title_cell = cells[2] if len(cells) > 2 else cells[1]
             title_link = title_cell.find('a')
@@ -484,53 +523,11 @@ class FinvizScraper:
     
     def _parse_datetime(self, date_text: str, time_text: str = "") -> Optional[datetime]:
         """Parse date and time strings into datetime object"""
-        try:
-            date_text = date_text.strip()
-            time_text = time_text.strip()
-            
-            now = datetime.now()
-            
-            if 'Today' in date_text or 'today' in date_text:
-                date_obj = now.date()
-            elif 'Yesterday' in date_text or 'yesterday' in date_text:
-                from datetime import timedelta
-                date_obj = (now - timedelta(days=1)).date()
-            elif re.match(r'\d{1,2}-\d{1,2}', date_text):
-                month, day = date_text.split('-')
-                date_obj = now.replace(month=int(month), day=int(day)).date()
-            else:
-                try:
-                    date_obj = datetime.strptime(date_text, '%b-%d-%y').date()
-                except:
-                    try:
-                        date_obj = datetime.strptime(date_text, '%m-%d-%y').date()
-                    except:
-                        date_obj = now.date()
-            
-            time_obj = None
-            if time_text:
-                try:
-                    time_obj = datetime.strptime(time_text, '%I:%M%p').time()
-                except:
-                    try:
-                        time_obj = datetime.strptime(time_text, '%H:%M').time()
-                    except:
-                        pass
-            
-            if time_obj:
-                return datetime.combine(date_obj, time_obj)
-            else:
-                return datetime.combine(date_obj, datetime.min.time())
-                
-        except Exception as e:
-
-                
-            pass
-            return None
+        return NewsDateParser().parse(date_text, time_text)
     
     def scrape_multiple_stocks(self, symbols: List[str], max_pages_per_stock: int = 5) -> Dict[str, List[Dict]]:
         """
-        Scrape news for multiple stock symbols
+        Scrape news for multiple stock symbols concurrently
         
         Args:
             symbols: List of stock symbols
@@ -539,15 +536,9 @@ class FinvizScraper:
         Returns:
             Dictionary mapping stock symbols to their articles
         """
-        results = {}
-        
-        for symbol in symbols:
-            articles = self.get_news_for_stock(symbol, max_pages_per_stock)
-            results[symbol] = articles
-            
-            time.sleep(1)
+        from async_scraper import AsyncFinvizScraper
         
-        return results
+        return AsyncFinvizScraper(scraper=self).run(symbols, max_pages_per_stock)
     
     def get_stock_data(self, symbol: str) -> Optional[Dict]:
         """
@@ -560,14 +551,19 @@ class FinvizScraper:
             Dictionary containing stock data or None if not found
         """
         try:
-            quote_url = f"{self.base_url}/quote.ashx?t={symbol.upper()}"
-            
-            
-            response = self.session.get(quote_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+            content = self._fetch_quote_page(symbol)
+        except requests.RequestException as e:
+            return None
+        
+        return self.parse_stock_page(content, symbol)
+    
+    def parse_stock_page(self, content: bytes, symbol: str) -> Optional[Dict]:
+        """Parse the fundamentals table of an already downloaded quote page"""
+        return self._extract_stock_data(self._make_soup(content), symbol)
+    
+    def _extract_stock_data(self, soup: BeautifulSoup, symbol: str) -> Optional[Dict]:
+        """Extract stock data from the snapshot table of a parsed quote page"""
+        try:
             quote_table = soup.find('table', {'class': 'snapshot-table2'})
             
             if not quote_table:
@@ -580,8 +576,6 @@ class FinvizScraper:
             else:
                 return None
                 
-        except requests.RequestException as e:
-            return None
         except Exception as e:
 
             pass
@@ -0,0 +1,175 @@
+"""
+Bulk fundamentals scraper for Finviz screener pages
+One screener page lists a full table of tickers with the same columns as
+the quote page snapshot, so many Stock rows are filled per request
+"""
+
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from bs4 import BeautifulSoup
+
+from config import Config
+from scraper import FinvizScraper
+
+logger = logging.getLogger(__name__)
+
+# Screener header label -> (Stock field, value kind)
+COLUMN_FIELDS = {
+    'ticker': ('symbol', 'text'),
+    'company': ('name', 'text'),
+    'sector': ('sector', 'text'),
+    'industry': ('industry', 'text'),
+    'country': ('country', 'text'),
+    'market cap': ('market_cap', 'text'),
+    'p/e': ('pe_ratio', 'float'),
+    'eps': ('eps', 'float'),
+    'eps (ttm)': ('eps', 'float'),
+    'dividend': ('dividend_yield', 'float'),
+    'dividend %': ('dividend_yield', 'float'),
+    'dividend yield': ('dividend_yield', 'float'),
+    'price': ('price', 'float'),
+    'change': ('change_percent', 'float'),
+    'volume': ('volume', 'int'),
+    'avg volume': ('avg_volume', 'int'),
+    'rsi': ('rsi', 'float'),
+    'rsi (14)': ('rsi', 'float'),
+    'sma20': ('sma_20', 'float'),
+    'sma50': ('sma_50', 'float'),
+    'sma200': ('sma_200', 'float'),
+}
+
+class FinvizScreener:
+    """
+    Fills Stock data for many symbols from screener.ashx result tables
+
+    Symbols are requested in batches through the screener ticker filter and
+    each batch is paginated until every symbol has been seen. Columns are
+    mapped by header label, so any screener view with a Ticker column works.
+    """
+
+    def __init__(self, scraper: Optional[FinvizScraper] = None,
+                 view: Optional[str] = None,
+                 columns: Optional[str] = None,
+                 batch_size: Optional[int] = None,
+                 page_size: Optional[int] = None):
+        self.scraper = scraper or FinvizScraper()
+        self.view = view or Config.SCREENER_VIEW
+        self.columns = Config.SCREENER_COLUMNS if columns is None else columns
+        self.batch_size = batch_size or Config.SCREENER_BATCH_SIZE
+        self.page_size = page_size or Config.SCREENER_PAGE_SIZE
+
+    def screener_url(self, symbols: List[str], offset: int = 1) -> str:
+        params = {'v': self.view}
+        if self.columns:
+            params['c'] = self.columns
+        params['t'] = ','.join(symbols)
+        if offset > 1:
+            params['r'] = offset
+        return f"{self.scraper.base_url}/screener.ashx?{urlencode(params, safe=',')}"
+
+    def get_stocks_data(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Stock data keyed by symbol, symbols missing from the screener are left out"""
+        results = {}
+        for symbol, stock_data in self.iter_stocks_data(symbols):
+            results[symbol] = stock_data
+        return results
+
+    def iter_stocks_data(self, symbols: List[str]) -> Iterator[Tuple[str, Dict]]:
+        """Yield (symbol, stock data) pairs page by page"""
+        unique_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+
+        for start in range(0, len(unique_symbols), self.batch_size):
+            batch = unique_symbols[start:start + self.batch_size]
+            yield from self._scrape_batch(batch)
+
+    def _scrape_batch(self, batch: List[str]) -> Iterator[Tuple[str, Dict]]:
+        wanted = set(batch)
+        seen = set()
+        offset = 1
+
+        while wanted - seen:
+            try:
+                content = self.scraper._fetch(self.screener_url(batch, offset))
+            except Exception as e:
+                logger.error(f"Error fetching screener page {offset} for {len(batch)} symbols: {e}")
+                return
+
+            rows = self.parse_screener_page(content)
+            new_rows = [row for row in rows if row['symbol'] not in seen]
+            if not new_rows:
+                return
+
+            for row in new_rows:
+                seen.add(row['symbol'])
+                if row['symbol'] in wanted:
+                    yield row['symbol'], row
+
+            if len(rows) < self.page_size:
+                return
+            offset += len(rows)
+
+    def parse_screener_page(self, content: bytes) -> List[Dict]:
+        """Parse every row of a screener result table"""
+        parser = 'html.parser' if self.scraper.parser_backend == 'html.parser' else 'lxml'
+        soup = BeautifulSoup(content, parser)
+
+        table, header_row = self._find_table(soup)
+        if table is None:
+            return []
+
+        headers = [cell.get_text(strip=True).lower() for cell in header_row.find_all(['th', 'td'], recursive=False)]
+
+        rows = []
+        for row in table.find_all('tr'):
+            if row is header_row:
+                continue
+            cells = row.find_all('td', recursive=False)
+            if len(cells) != len(headers):
+                continue
+
+            stock_data = self._parse_row(headers, cells)
+            if stock_data:
+                rows.append(stock_data)
+
+        return rows
+
+    def _find_table(self, soup: BeautifulSoup):
+        """Locate the results table by its Ticker header cell"""
+        for table in soup.find_all('table', class_='screener_table') or soup.find_all('table'):
+            for row in table.find_all('tr'):
+                labels = [cell.get_text(strip=True).lower() for cell in row.find_all(['th', 'td'], recursive=False)]
+                if 'ticker' in labels:
+                    return table, row
+                if labels:
+                    break
+        return None, None
+
+    def _parse_row(self, headers: List[str], cells) -> Optional[Dict]:
+        stock_data = {'currency': 'USD'}
+
+        for label, cell in zip(headers, cells):
+            column = COLUMN_FIELDS.get(label)
+            if not column:
+                continue
+
+            field, kind = column
+            value = cell.get_text(strip=True)
+            if kind == 'float':
+                stock_data[field] = self.scraper._parse_float(value)
+            elif kind == 'int':
+                stock_data[field] = self.scraper._parse_int(value)
+            elif value and value != '-':
+                stock_data[field] = value
+
+        if not stock_data.get('symbol'):
+            return None
+        stock_data['symbol'] = stock_data['symbol'].upper()
+
+        price = stock_data.get('price')
+        change_percent = stock_data.get('change_percent')
+        if price and change_percent is not None and change_percent != -100:
+            stock_data['change'] = round(price - price / (1 + change_percent / 100), 2)
+
+        return stock_data
@@ -0,0 +1,209 @@
+"""
+Sentiment backend benchmark
+Usage: python scripts/benchmark_sentiment.py [--backends torch onnx] [--texts 256] [--batch-size 32]
+
+Runs each transformer backend in its own interpreter so peak RSS is
+measured in isolation, and reports model load time, single-text latency,
+batched throughput and peak RSS. When both backends run, the ONNX scores are
+compared against torch using the tolerance documented in onnx_sentiment.py.
+Headlines come from the news_articles table when --from-db is given,
+otherwise from a built-in sample.
+
+With --cascade it instead compares cascade mode against the full ensemble
+on one backend: escalation rate, label agreement and time per text.
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import resource
+import statistics
+import subprocess
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_HEADLINES = [
+    "Apple beats earnings expectations as iPhone sales surge",
+    "Tesla shares tumble after disappointing delivery numbers",
+    "Microsoft announces quarterly dividend, unchanged from prior quarter",
+    "Nvidia stock hits record high on booming AI chip demand",
+    "Amazon faces antitrust lawsuit from federal regulators",
+    "Intel cuts full-year guidance, shares fall sharply in late trading",
+    "Meta Platforms to lay off thousands in latest cost-cutting push",
+    "Alphabet unveils new AI model, analysts remain cautious",
+    "Pfizer wins FDA approval for new RSV vaccine",
+    "JPMorgan reports record profit on higher interest income",
+    "Boeing halts deliveries after discovering new manufacturing defect",
+    "Coca-Cola raises outlook as price increases offset volume declines",
+    "Netflix subscriber growth slows, stock slides",
+    "AMD gains market share in data center processors",
+    "Walmart to expand drone delivery to four more states",
+    "Exxon Mobil profit falls from record as oil prices ease",
+]
+
+def load_texts(count: int, from_db: bool) -> list:
+    texts = []
+    if from_db:
+        from database import SessionLocal
+        from models import NewsArticle
+
+        db = SessionLocal()
+        try:
+            rows = db.query(NewsArticle.title, NewsArticle.summary).order_by(NewsArticle.id.desc()).limit(count).all()
+            texts = [f"{title} {summary}" if summary else title for title, summary in rows]
+        finally:
+            db.close()
+    if not texts:
+        texts = SAMPLE_HEADLINES
+    return (texts * (count // len(texts) + 1))[:count]
+
+def run_backend(backend: str, texts: list, batch_size: int, repeats: int) -> dict:
+    """Benchmark one backend in this process, returning timings and raw scores"""
+    from sentiment_analyzer import SentimentAnalyzer
+    from sentiment_cache import SentimentCache
+
+    analyzer = SentimentAnalyzer(backend=backend, cache=SentimentCache(persistent=False))
+
+    started = time.perf_counter()
+    if not analyzer.load_transformers():
+        raise RuntimeError(analyzer.model_status()['error'] or f"{backend} backend is unavailable")
+    load_seconds = time.perf_counter() - started
+
+    pipeline = analyzer.transformers_pipeline
+    pipeline(texts[0])
+
+    latencies = []
+    for text in texts[:repeats]:
+        started = time.perf_counter()
+        pipeline(text)
+        latencies.append(time.perf_counter() - started)
+
+    cleaned = [analyzer.clean_text(text) for text in texts]
+    started = time.perf_counter()
+    for start in range(0, len(cleaned), batch_size):
+        pipeline(cleaned[start:start + batch_size], batch_size=batch_size, truncation=True)
+    batch_seconds = time.perf_counter() - started
+
+    scores = [
+        {item['label'].lower(): item['score'] for item in result}
+        for result in pipeline(cleaned[:repeats], batch_size=batch_size, truncation=True)
+    ]
+
+    return {
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'latency_p50_ms': statistics.median(latencies) * 1000,
+        'latency_p95_ms': statistics.quantiles(latencies, n=20)[-1] * 1000 if len(latencies) > 1 else latencies[0] * 1000,
+        'throughput_per_s': len(cleaned) / batch_seconds,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'scores': scores
+    }
+
+def run_cascade(backend: str, texts: list, batch_size: int) -> dict:
+    """Score texts in accurate and cascade mode, returning label agreement and escalation rate"""
+    from sentiment_analyzer import SentimentAnalyzer
+    from sentiment_cache import SentimentCache
+
+    timings = {}
+    labels = {}
+    for mode in ('accurate', 'cascade'):
+        analyzer = SentimentAnalyzer(backend=backend, cache=SentimentCache(persistent=False))
+        analyzer.load_transformers()
+        started = time.perf_counter()
+        results = analyzer.analyze_batch(texts, batch_size, mode=mode)
+        timings[mode] = (time.perf_counter() - started) / len(texts) * 1000
+        labels[mode] = [result['sentiment_label'] for result in results]
+
+    return {
+        'label_agreement': statistics.mean(a == b for a, b in zip(labels['accurate'], labels['cascade'])),
+        'ms_per_text': timings,
+        **analyzer.cascade_stats()
+    }
+
+def compare(reference: list, candidate: list) -> dict:
+    from onnx_sentiment import LABEL_AGREEMENT, SCORE_TOLERANCE
+
+    max_diff = max(abs(ref[label] - cand[label]) for ref, cand in zip(reference, candidate) for label in ref)
+    agreement = statistics.mean(
+        max(ref, key=ref.get) == max(cand, key=cand.get) for ref, cand in zip(reference, candidate)
+    )
+    return {
+        'max_abs_diff': max_diff,
+        'label_agreement': agreement,
+        'within_tolerance': max_diff <= SCORE_TOLERANCE and agreement >= LABEL_AGREEMENT
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the torch and ONNX sentiment backends')
+    parser.add_argument('--backends', nargs='+', default=['torch', 'onnx'], choices=['torch', 'onnx'])
+    parser.add_argument('--texts', type=int, default=256, help='Number of texts for the throughput run')
+    parser.add_argument('--repeats', type=int, default=64, help='Single-text calls for the latency run')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--from-db', action='store_true', help='Use stored headlines instead of the built-in sample')
+    parser.add_argument('--cascade', action='store_true', help='Compare cascade mode with the full ensemble on the first backend')
+    parser.add_argument('--run-backend', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    texts = load_texts(args.texts, args.from_db)
+
+    if args.cascade:
+        # Distinct texts, so the result cache does not hide scoring work
+        texts = [f"{text} ({index})" for index, text in enumerate(texts)]
+        result = run_cascade(args.backends[0], texts, args.batch_size)
+        print(f"cascade escalated {result['escalated']}/{result['scored']} texts ({result['escalation_rate']:.1%}) "
+              f"at threshold {result['threshold']}")
+        print(f"label agreement with accurate: {result['label_agreement']:.1%}")
+        print(f"ms per text: accurate {result['ms_per_text']['accurate']:.2f}, cascade {result['ms_per_text']['cascade']:.2f}")
+        return 0
+
+    if args.run_backend:
+        try:
+            result = run_backend(args.run_backend, texts, args.batch_size, min(args.repeats, len(texts)))
+        except Exception as e:
+            print(f"{args.run_backend}: {e}")
+            return 1
+        with open(args.output, 'w') as f:
+            json.dump(result, f)
+        return 0
+
+    results = {}
+    for backend in args.backends:
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            output = f.name
+        command = [
+            sys.executable, os.path.abspath(__file__), '--run-backend', backend, '--output', output,
+            '--texts', str(args.texts), '--repeats', str(args.repeats), '--batch-size', str(args.batch_size)
+        ] + (['--from-db'] if args.from_db else [])
+        completed = subprocess.run(command)
+        if completed.returncode != 0:
+            print(f"{backend}: benchmark failed")
+            continue
+        with open(output) as f:
+            results[backend] = json.load(f)
+        os.unlink(output)
+
+    if not results:
+        return 1
+
+    print(f"{'backend':<8} {'load s':>8} {'p50 ms':>8} {'p95 ms':>8} {'texts/s':>9} {'RSS MB':>8}")
+    for backend, result in results.items():
+        print(f"{backend:<8} {result['load_seconds']:>8.2f} {result['latency_p50_ms']:>8.1f} "
+              f"{result['latency_p95_ms']:>8.1f} {result['throughput_per_s']:>9.1f} {result['peak_rss_mb']:>8.0f}")
+
+    if 'torch' in results and 'onnx' in results:
+        comparison = compare(results['torch']['scores'], results['onnx']['scores'])
+        print(f"onnx vs torch: max abs score diff {comparison['max_abs_diff']:.4f}, "
+              f"top label agreement {comparison['label_agreement']:.1%}, "
+              f"{'within' if comparison['within_tolerance'] else 'OUTSIDE'} tolerance")
+        if not comparison['within_tolerance']:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
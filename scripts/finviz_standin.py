@@ -0,0 +1,138 @@
+"""
+Local stand-in for finviz.com serving recorded fixtures
+Usage: python scripts/finviz_standin.py --port 8800 --latency 0.2 --error-rate 0.05 --throttle-rate 0.1
+
+Point the scraper at it with FINVIZ_BASE_URL=http://127.0.0.1:8800 to measure
+throughput, retries and concurrency offline and reproducibly
+"""
+
+import sys
+import os
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from fixture_replay import fixture_name
+
+class StandInStats:
+    """Thread-safe response counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, status: int):
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+
+    def summary(self) -> str:
+        with self._lock:
+            return ', '.join(f"{status}: {count}" for status, count in sorted(self.counts.items())) or 'no requests'
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+def make_handler(args, stats: StandInStats, rng: random.Random):
+    rng_lock = threading.Lock()
+
+    fallback = None
+    if args.fallback_quote:
+        with open(args.fallback_quote, 'rb') as f:
+            fallback = f.read()
+
+    def roll() -> float:
+        with rng_lock:
+            return rng.random()
+
+    def delay() -> float:
+        with rng_lock:
+            return max(0.0, rng.gauss(args.latency, args.jitter)) if args.jitter else args.latency
+
+    class FinvizStandInHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(delay())
+
+            if roll() < args.throttle_rate:
+                return self._send(429, b'Too Many Requests', {'Retry-After': str(args.retry_after)})
+            if roll() < args.error_rate:
+                return self._send(503, b'Service Unavailable')
+
+            body = self._load(self.path)
+            if body is None:
+                return self._send(404, b'Not Found')
+            self._send(200, body, {'Content-Type': 'text/html; charset=utf-8'})
+
+        def _load(self, path: str):
+            fixture_path = os.path.join(args.fixtures, fixture_name(path))
+            if os.path.exists(fixture_path):
+                with open(fixture_path, 'rb') as f:
+                    return f.read()
+
+            parts = urlsplit(path)
+            symbol = parse_qs(parts.query).get('t', [''])[0].upper()
+            if fallback is not None and parts.path.endswith('/quote.ashx') and symbol:
+                return fallback.replace(args.fallback_symbol.encode(), symbol.encode())
+            return None
+
+        def _send(self, status: int, body: bytes, headers=None):
+            self.send_response(status)
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            stats.record(status)
+
+        def log_message(self, format, *log_args):
+            if not args.quiet:
+                super().log_message(format, *log_args)
+
+    return FinvizStandInHandler
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve recorded Finviz fixtures with injected latency and errors')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8800, help='Port to listen on')
+    parser.add_argument('--fixtures', default=Config.SCRAPER_FIXTURE_DIR, help='Directory of recorded pages')
+    parser.add_argument('--fallback-quote', default=None, help='Quote page served for symbols without a recording')
+    parser.add_argument('--fallback-symbol', default='AAPL', help='Symbol in the fallback page replaced by the requested one')
+    parser.add_argument('--latency', type=float, default=0.0, help='Mean response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Standard deviation of the latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429 responses')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible error injection')
+    parser.add_argument('--quiet', action='store_true', help='Do not log every request')
+
+    args = parser.parse_args()
+
+    stats = StandInStats()
+    server = StandInServer((args.host, args.port), make_handler(args, stats, random.Random(args.seed)))
+
+    print(f"Serving {args.fixtures} on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Responses: {stats.summary()}")
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,63 @@
+"""
+Cold import time measurement
+Usage: python scripts/measure_import_time.py [--module main] [--top 15] [--max-seconds 2.0]
+
+Imports the module in a fresh interpreter with -X importtime and reports
+the total time and the slowest imports. Exits non-zero when the total is
+above --max-seconds, so it can guard against heavy imports creeping back
+into the startup path.
+"""
+
+import sys
+import os
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def measure(module: str):
+    """Return (total_us, [(cumulative_us, self_us, name)]) for a cold import of module"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    total = next((cumulative for cumulative, _, name in imports if name.strip() == module), 0)
+    return total, imports
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cold import time of a module')
+    parser.add_argument('--module', default='main', help='Module to import')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    parser.add_argument('--max-seconds', type=float, default=None, help='Fail when the import takes longer')
+
+    args = parser.parse_args()
+
+    try:
+        total, imports = measure(args.module)
+    except RuntimeError as e:
+        print(e)
+        return 1
+
+    print(f"import {args.module}: {total / 1e6:.3f}s")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, name in sorted(imports, reverse=True)[:args.top]:
+        print(f"{cumulative / 1e3:>10.1f}ms {self_us / 1e3:>8.1f}ms  {name.strip()}")
+
+    if args.max_seconds is not None and total / 1e6 > args.max_seconds:
+        print(f"Import time is above the {args.max_seconds}s limit")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -12,52 +12,28 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from scraper import FinvizScraper
 from database import SessionLocal, create_tables
-from models import NewsArticle
+from services import NewsService
 from config import Config
 
 def scrape_and_store(symbols, max_pages=5):
-    """Scrape news for given symbols and store in database"""
+    """Scrape news newer than each symbol's watermark and store it in database"""
     scraper = FinvizScraper()
     db = SessionLocal()
     
     try:
         create_tables()
         
+        service = NewsService(db, scraper=scraper)
         total_stored = 0
         
         for symbol in symbols:
             
             try:
-                articles = scraper.get_news_for_stock(symbol, max_pages)
-                
-                stored_count = 0
-                for article_data in articles:
-                    try:
-                        existing = db.query(NewsArticle).filter(
-                            NewsArticle.link == article_data['link']
-                        ).first()
-                        
-                        if not existing:
-                            db_article = NewsArticle(
-                                title=article_data['title'],
-                                link=article_data['link'],
-                                summary=article_data.get('summary', ''),
-                                source=article_data.get('source', ''),
-                                stock_symbol=article_data['stock_symbol'],
-                                published_date=article_data.get('published_date')
-                            )
-                            
-                            db.add(db_article)
-                            stored_count += 1
-                        else:
-                    
-                    except Exception as e:
-                        continue
-                
-                db.commit()
-                total_stored += stored_count
+                result = service.scrape_new_news(symbol, max_pages)
+                total_stored += result['saved']
                 
             except Exception as e:
+                db.rollback()
                 continue
         
         return total_stored
@@ -4,16 +4,22 @@ Uses multiple sentiment analysis methods for comprehensive analysis
 """
 
 import re
+import time
 import logging
-from typing import Dict, List, Optional, Tuple
+import threading
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import statistics
 
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
+from config import Config
+from sentiment_cache import SentimentCache, cache_key
+from sentiment_pool import get_lexicon_pool
+
+# TextBlob (via NLTK) and Transformers are slow to import, so only their
+# presence is checked here and they are imported on first use
+TEXTBLOB_AVAILABLE = find_spec("textblob") is not None
+if not TEXTBLOB_AVAILABLE:
     logging.warning("TextBlob not available. Install with: pip install textblob")
 
 try:
@@ -23,36 +29,159 @@ except ImportError:
     VADER_AVAILABLE = False
     logging.warning("VADER not available. Install with: pip install vaderSentiment")
 
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+TRANSFORMERS_AVAILABLE = find_spec("transformers") is not None
+if not TRANSFORMERS_AVAILABLE:
     logging.warning("Transformers not available. Install with: pip install transformers torch")
 
+# Everything the ONNX backend imports, for the one-off export and quantization and for inference
+ONNX_BACKEND_MODULES = ('onnxruntime', 'onnx', 'torch', 'transformers', 'numpy')
+ONNX_MISSING_MODULES = [name for name in ONNX_BACKEND_MODULES if find_spec(name) is None]
+
+# 'torch' runs the Hugging Face pipeline, 'onnx' an int8 quantized export of
+# the same model on onnxruntime (see onnx_sentiment.py)
+SENTIMENT_BACKENDS = ('torch', 'onnx')
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever cleaning, scoring or combination rules change, so cached
+# results computed by older code are no longer used
+ANALYZER_VERSION = "3"
+
+# Scorers run by each analysis mode, cheapest first
+SENTIMENT_MODES = {
+    'fast': ('vader',),
+    'balanced': ('vader', 'textblob'),
+    'accurate': ('vader', 'textblob', 'transformers'),
+    # balanced, escalating to accurate only for uncertain texts
+    'cascade': ('vader', 'textblob', 'transformers'),
+}
+
+MODEL_STATES = ('unavailable', 'not_loaded', 'loading', 'ready', 'failed')
+
 class SentimentAnalyzer:
     """
     Comprehensive sentiment analysis using multiple methods
+    
+    The Transformers model is loaded on first use or by warmup(), never at
+    construction, so importing this module stays cheap
     """
     
-    def __init__(self):
+    def __init__(self, model_name: Optional[str] = None, cache: Optional[SentimentCache] = None,
+                 backend: Optional[str] = None):
         self.vader_analyzer = None
-        self.transformers_pipeline = None
+        self.model_name = model_name or Config.SENTIMENT_MODEL
+        self.cache = cache or SentimentCache()
+        
+        self.backend = backend or Config.SENTIMENT_BACKEND
+        if self.backend not in SENTIMENT_BACKENDS:
+            raise ValueError(f"Unknown sentiment backend '{self.backend}', expected one of: {', '.join(SENTIMENT_BACKENDS)}")
+        if self.backend == 'onnx' and ONNX_MISSING_MODULES:
+            logger.warning(f"ONNX backend needs {', '.join(ONNX_MISSING_MODULES)}, falling back to torch. "
+                           f"Install with: pip install {' '.join(ONNX_MISSING_MODULES)}")
+            self.backend = 'torch'
+        
+        available = TRANSFORMERS_AVAILABLE
+        self._pipeline = None
+        self._model_state = 'not_loaded' if available else 'unavailable'
+        self._model_error: Optional[str] = None
+        self._load_seconds: Optional[float] = None
+        self._load_lock = threading.Lock()
+        
+        self._cascade_lock = threading.Lock()
+        self._cascade_counts = {'scored': 0, 'escalated': 0}
         
         if VADER_AVAILABLE:
             self.vader_analyzer = SentimentIntensityAnalyzer()
-        
-        if TRANSFORMERS_AVAILABLE:
+    
+    @property
+    def transformers_pipeline(self):
+        """The Transformers pipeline, loading it on first access"""
+        if self._model_state == 'not_loaded' or self._model_state == 'loading':
+            self.load_transformers()
+        return self._pipeline
+    
+    def load_transformers(self) -> bool:
+        """Load the Transformers pipeline once, returning whether it is ready"""
+        with self._load_lock:
+            if self._model_state != 'not_loaded':
+                return self._model_state == 'ready'
+            
+            self._model_state = 'loading'
+            started = time.monotonic()
             try:
-                self.transformers_pipeline = pipeline(
-                    "sentiment-analysis",
-                    model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                    return_all_scores=True
-                )
+                if self.backend == 'onnx':
+                    from onnx_sentiment import load_onnx_pipeline
+                    
+                    self._pipeline = load_onnx_pipeline(self.model_name)
+                else:
+                    from transformers import pipeline
+                    
+                    self._pipeline = pipeline(
+                        "sentiment-analysis",
+                        model=self.model_name,
+                        return_all_scores=True
+                    )
+                self._model_state = 'ready'
             except Exception as e:
-                self.transformers_pipeline = None
+                self._pipeline = None
+                self._model_error = str(e)
+                self._model_state = 'failed'
+                logger.error(f"Failed to load sentiment model {self.model_name}: {e}")
+            
+            self._load_seconds = time.monotonic() - started
+            return self._model_state == 'ready'
+    
+    def warmup(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load the Transformers model ahead of the first request, in a daemon thread by default"""
+        if self._model_state != 'not_loaded':
+            return None
+        if not background:
+            self.load_transformers()
+            return None
+        
+        thread = threading.Thread(target=self.load_transformers, name='sentiment-warmup', daemon=True)
+        thread.start()
+        return thread
+    
+    def needs_model(self, mode: Optional[str] = None) -> bool:
+        """Whether a mode, the configured one by default, runs the Transformers model"""
+        return 'transformers' in SENTIMENT_MODES[self.resolve_mode(mode)]
+    
+    def model_status(self) -> Dict[str, Any]:
+        """
+        Readiness of the Transformers model, for health checks
+        A missing or failed model only counts as ready when the configured mode doesn't use it
+        """
+        return {
+            'model': self.model_name,
+            'backend': self.backend,
+            'state': self._model_state,
+            'ready': self._model_state == 'ready' or not self.needs_model(),
+            'load_seconds': round(self._load_seconds, 2) if self._load_seconds is not None else None,
+            'error': self._model_error
+        }
+    
+    def version_for(self, mode: str) -> str:
+        """
+        Identifies the scorers that produce results in a mode, part of every cache key
+        Read from the model state so building a key never loads the model
+        """
+        methods = SENTIMENT_MODES[mode]
+        version = f"{ANALYZER_VERSION}:{mode}:vader={VADER_AVAILABLE}"
+        if 'textblob' in methods:
+            version += f":textblob={TEXTBLOB_AVAILABLE}"
+        if 'transformers' in methods:
+            model = 'none' if self._model_state in ('unavailable', 'failed') else f"{self.model_name}@{self.backend}"
+            version += f":{model}"
+        if mode == 'cascade':
+            version += f":threshold={Config.SENTIMENT_CASCADE_THRESHOLD}"
+        return version
+    
+    def resolve_mode(self, mode: Optional[str] = None) -> str:
+        mode = mode or Config.SENTIMENT_MODE
+        if mode not in SENTIMENT_MODES:
+            raise ValueError(f"Unknown sentiment mode '{mode}', expected one of: {', '.join(SENTIMENT_MODES)}")
+        return mode
     
     def clean_text(self, text: str) -> str:
         """Clean and preprocess text for sentiment analysis"""
@@ -79,6 +208,8 @@ class SentimentAnalyzer:
             }
         
         try:
+            from textblob import TextBlob
+            
             blob = TextBlob(text)
             polarity = blob.sentiment.polarity
             subjectivity = blob.sentiment.subjectivity
@@ -166,36 +297,161 @@ class SentimentAnalyzer:
                 'score': 0.0
             }
     
-    def analyze_sentiment(self, text: str) -> Dict:
+    def analyze_batch_with_transformers(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
+        """
+        Analyze many texts with the Transformers pipeline in padded batches
+        
+        Texts are sorted by length so each batch is padded only to its longest
+        member. Results are returned in input order.
+        """
+        neutral = {'label': 'neutral', 'score': 0.0}
+        results = [dict(neutral) for _ in texts]
+        if not TRANSFORMERS_AVAILABLE or not self.transformers_pipeline:
+            return results
+        
+        batch_size = batch_size or Config.SENTIMENT_BATCH_SIZE
+        order = sorted((index for index, text in enumerate(texts) if text), key=lambda index: len(texts[index]))
+        
+        for start in range(0, len(order), batch_size):
+            indices = order[start:start + batch_size]
+            batch = [texts[index][:512] for index in indices]
+            try:
+                outputs = self.transformers_pipeline(batch, batch_size=len(batch), truncation=True)
+            except Exception as e:
+                logger.warning(f"Batched transformer inference failed, falling back to single texts: {e}")
+                outputs = None
+            
+            for position, index in enumerate(indices):
+                if outputs is None:
+                    results[index] = self.analyze_with_transformers(texts[index])
+                    continue
+                best_result = max(outputs[position], key=lambda x: x['score'])
+                results[index] = {
+                    'label': best_result['label'].lower(),
+                    'score': best_result['score']
+                }
+        
+        return results
+    
+    def analyze_batch_with_lexicons(self, texts: List[str], methods: Tuple[str, ...] = ('vader', 'textblob')) -> List[Tuple[Dict, Dict]]:
+        """(TextBlob, VADER) results per text, sharded across worker processes for large batches"""
+        return get_lexicon_pool().score(self, texts, methods)
+    
+    def analyze_sentiment(self, text: str, mode: Optional[str] = None) -> Dict:
         """
         Comprehensive sentiment analysis using multiple methods
         
         Args:
             text: Text to analyze (title + summary)
+            mode: 'fast' (VADER), 'balanced' (VADER and TextBlob),
+                'accurate' (all three, the default) or 'cascade' (balanced,
+                with the transformer only for uncertain texts)
         
         Returns:
             Dictionary with sentiment analysis results
         """
-        if not text:
-            return self._get_default_sentiment()
-        
-        cleaned_text = self.clean_text(text)
+        return self.analyze_batch([text], mode=mode)[0]
+    
+    def analyze_batch(self, texts: List[str], batch_size: Optional[int] = None, mode: Optional[str] = None) -> List[Dict]:
+        """
+        Sentiment analysis of many texts at once, same results as analyze_sentiment
         
-        if not cleaned_text:
-            return self._get_default_sentiment()
+        Cached and repeated texts are scored once. TextBlob and VADER run on
+        the lexicon worker pool for large batches, the Transformers model runs
+        in length-sorted batches. Results are returned in input order.
+        """
+        mode = self.resolve_mode(mode)
+        methods = SENTIMENT_MODES[mode]
+        version = self.version_for(mode)
+        cleaned_texts = [self.clean_text(text) if text else "" for text in texts]
+        keys = [cache_key(version, cleaned_text) if cleaned_text else None for cleaned_text in cleaned_texts]
+        
+        known = self.cache.get_many(key for key in keys if key)
+        pending = {key: cleaned_text for key, cleaned_text in zip(keys, cleaned_texts) if key and key not in known}
+        
+        if pending:
+            pending_texts = list(pending.values())
+            lexicon_results = self.analyze_batch_with_lexicons(pending_texts, methods)
+            if mode == 'cascade':
+                escalate = [self.needs_escalation(textblob_result, vader_result) for textblob_result, vader_result in lexicon_results]
+                self._record_cascade(len(pending_texts), sum(escalate))
+            else:
+                escalate = ['transformers' in methods] * len(pending_texts)
+            
+            escalated_texts = [text for text, escalated in zip(pending_texts, escalate) if escalated]
+            escalated_results = iter(
+                self.analyze_batch_with_transformers(escalated_texts, batch_size) if escalated_texts else []
+            )
+            transformers_results = [
+                next(escalated_results) if escalated else {'label': 'neutral', 'score': 0.0}
+                for escalated in escalate
+            ]
+            
+            computed = {}
+            for key, (textblob_result, vader_result), transformers_result, escalated in zip(
+                pending, lexicon_results, transformers_results, escalate
+            ):
+                computed[key] = self._build_result(textblob_result, vader_result, transformers_result, mode,
+                                                   escalated and mode == 'cascade')
+            # a model that failed to load mid-batch leaves results that don't belong under this version
+            if self.version_for(mode) == version:
+                self.cache.put_many(version, computed)
+            known.update(computed)
+        
+        results = []
+        for key in keys:
+            results.append(dict(known[key]) if key else self._get_default_sentiment(mode))
+        
+        return results
+    
+    def needs_escalation(self, textblob_result: Dict, vader_result: Dict) -> bool:
+        """
+        Whether the lexicon scorers are too unsure of a text to skip the
+        transformer: their labels point in opposite directions, or their
+        combined score is weaker than SENTIMENT_CASCADE_THRESHOLD
+        """
+        labels = {textblob_result['label'], vader_result['label']}
+        if {'positive', 'negative'} <= labels:
+            return True
         
-        textblob_result = self.analyze_with_textblob(cleaned_text)
-        vader_result = self.analyze_with_vader(cleaned_text)
-        transformers_result = self.analyze_with_transformers(cleaned_text)
+        lexicon = self._combine_sentiment_results(
+            textblob_result, vader_result, {'label': 'neutral', 'score': 0.0}, SENTIMENT_MODES['balanced']
+        )
+        return abs(lexicon['score']) < Config.SENTIMENT_CASCADE_THRESHOLD
+    
+    def _record_cascade(self, scored: int, escalated: int):
+        with self._cascade_lock:
+            self._cascade_counts['scored'] += scored
+            self._cascade_counts['escalated'] += escalated
+    
+    def cascade_stats(self) -> Dict[str, Any]:
+        """How many texts cascade mode scored and how many went to the transformer"""
+        with self._cascade_lock:
+            scored = self._cascade_counts['scored']
+            escalated = self._cascade_counts['escalated']
+        return {
+            'scored': scored,
+            'escalated': escalated,
+            'escalation_rate': round(escalated / scored, 4) if scored else 0.0,
+            'threshold': Config.SENTIMENT_CASCADE_THRESHOLD
+        }
+    
+    def _build_result(self, textblob_result: Dict, vader_result: Dict, transformers_result: Dict,
+                      mode: str = 'accurate', escalated: bool = False) -> Dict:
+        methods = SENTIMENT_MODES[mode]
+        if mode == 'cascade' and not escalated:
+            methods = SENTIMENT_MODES['balanced']
         
         overall_sentiment = self._combine_sentiment_results(
-            textblob_result, vader_result, transformers_result
+            textblob_result, vader_result, transformers_result, methods
         )
         
         return {
             'sentiment_score': overall_sentiment['score'],
             'sentiment_label': overall_sentiment['label'],
             'sentiment_confidence': overall_sentiment['confidence'],
+            'sentiment_mode': mode,
+            'sentiment_escalated': escalated,
             'textblob_polarity': textblob_result['polarity'],
             'textblob_subjectivity': textblob_result['subjectivity'],
             'vader_compound': vader_result['compound'],
@@ -206,10 +462,12 @@ class SentimentAnalyzer:
             'transformers_score': transformers_result['score']
         }
     
-    def _combine_sentiment_results(self, textblob: Dict, vader: Dict, transformers: Dict) -> Dict:
-        """Combine results from multiple sentiment analysis methods"""
+    def _combine_sentiment_results(self, textblob: Dict, vader: Dict, transformers: Dict,
+                                   methods: Tuple[str, ...] = SENTIMENT_MODES['accurate']) -> Dict:
+        """Combine results from the sentiment analysis methods a mode ran"""
         
-        labels = [textblob['label'], vader['label'], transformers['label']]
+        results = {'textblob': textblob, 'vader': vader, 'transformers': transformers}
+        labels = [results[method]['label'] for method in methods]
         
         label_counts = {
             'positive': labels.count('positive'),
@@ -257,12 +515,14 @@ class SentimentAnalyzer:
             'confidence': confidence
         }
     
-    def _get_default_sentiment(self) -> Dict:
+    def _get_default_sentiment(self, mode: str = 'accurate') -> Dict:
         """Return default sentiment when analysis fails"""
         return {
             'sentiment_score': 0.0,
             'sentiment_label': 'neutral',
             'sentiment_confidence': 0.0,
+            'sentiment_mode': mode,
+            'sentiment_escalated': False,
             'textblob_polarity': 0.0,
             'textblob_subjectivity': 0.0,
             'vader_compound': 0.0,
@@ -273,22 +533,30 @@ class SentimentAnalyzer:
             'transformers_score': 0.0
         }
     
-    def analyze_article(self, title: str, summary: str = "") -> Dict:
+    def analyze_article(self, title: str, summary: str = "", mode: Optional[str] = None) -> Dict:
         """
         Analyze sentiment of a news article
         
         Args:
             title: Article title
             summary: Article summary (optional)
+            mode: Analysis mode, see analyze_sentiment
         
         Returns:
             Dictionary with sentiment analysis results
         """
+        return self.analyze_sentiment(self.article_text(title, summary), mode)
+    
+    def analyze_articles(self, articles: List[Tuple[str, str]], batch_size: Optional[int] = None,
+                         mode: Optional[str] = None) -> List[Dict]:
+        """Batched analyze_article over (title, summary) pairs, in input order"""
+        return self.analyze_batch([self.article_text(title, summary) for title, summary in articles], batch_size, mode)
+    
+    def article_text(self, title: str, summary: str = "") -> str:
         full_text = f"{title}"
         if summary:
             full_text += f" {summary}"
-        
-        return self.analyze_sentiment(full_text)
+        return full_text
     
     def get_stock_sentiment_summary(self, articles: List[Dict]) -> Dict:
         """
@@ -0,0 +1,145 @@
+"""
+Content-addressed cache of sentiment analysis results
+Results are keyed by a hash of the analyzer version and the cleaned text,
+kept in an in-process LRU and, when enabled, in the sentiment_cache table
+so they survive restarts and are shared between processes
+"""
+
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def cache_key(version: str, cleaned_text: str) -> str:
+    return hashlib.sha256(f"{version}\0{cleaned_text}".encode('utf-8')).hexdigest()
+
+class SentimentCache:
+    """
+    Two-tier result cache, memory first and then the database
+
+    The database tier is optional; it is skipped for the rest of the process
+    after the first connection or query error.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, persistent: Optional[bool] = None,
+                 session_factory: Optional[Callable] = None):
+        self.max_entries = max_entries or Config.SENTIMENT_CACHE_SIZE
+        self.persistent = Config.SENTIMENT_CACHE_PERSIST if persistent is None else persistent
+        self._session_factory = session_factory
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._counts = {'memory_hits': 0, 'db_hits': 0, 'misses': 0, 'stored': 0}
+
+    def _session(self):
+        if self._session_factory is None:
+            # Imported lazily so the analyzer works without a database
+            from database import SessionLocal
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _remember(self, key: str, result: Dict):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict]:
+        """Cached results for the given keys, copies safe to modify"""
+        found: Dict[str, Dict] = {}
+        missing = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = dict(self._entries[key])
+                    self._counts['memory_hits'] += 1
+                else:
+                    missing.append(key)
+
+        if missing and self.persistent:
+            for key, result in self._load(missing).items():
+                found[key] = dict(result)
+                with self._lock:
+                    self._remember(key, result)
+                    self._counts['db_hits'] += 1
+
+        with self._lock:
+            self._counts['misses'] += len(missing) - sum(1 for key in missing if key in found)
+        return found
+
+    def put_many(self, version: str, results: Dict[str, Dict]):
+        """Store freshly computed results under their keys"""
+        if not results:
+            return
+        with self._lock:
+            for key, result in results.items():
+                self._remember(key, dict(result))
+            self._counts['stored'] += len(results)
+
+        if self.persistent:
+            self._store(version, results)
+
+    def _load(self, keys: list) -> Dict[str, Dict]:
+        from models import SentimentCacheEntry
+
+        try:
+            db = self._session()
+        except Exception as e:
+            self._disable_persistence(e)
+            return {}
+        try:
+            rows = db.query(SentimentCacheEntry.key, SentimentCacheEntry.result).filter(
+                SentimentCacheEntry.key.in_(keys)
+            ).all()
+            return {key: json.loads(result) for key, result in rows}
+        except Exception as e:
+            self._disable_persistence(e)
+            return {}
+        finally:
+            db.close()
+
+    def _store(self, version: str, results: Dict[str, Dict]):
+        from models import SentimentCacheEntry
+
+        try:
+            db = self._session()
+        except Exception as e:
+            self._disable_persistence(e)
+            return
+        try:
+            existing = {key for key, in db.query(SentimentCacheEntry.key).filter(SentimentCacheEntry.key.in_(list(results)))}
+            db.add_all(
+                SentimentCacheEntry(key=key, analyzer_version=version, result=json.dumps(result))
+                for key, result in results.items() if key not in existing
+            )
+            db.commit()
+        except Exception as e:
+            # Another process stored the same text first, the cached value is equivalent
+            db.rollback()
+            logger.debug(f"Sentiment cache write skipped: {e}")
+        finally:
+            db.close()
+
+    def _disable_persistence(self, error: Exception):
+        logger.warning(f"Sentiment cache database tier disabled: {error}")
+        self.persistent = False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'persistent': self.persistent,
+                **self._counts
+            }
@@ -0,0 +1,103 @@
+"""
+Process pool for the lexicon sentiment scorers
+TextBlob and VADER are pure Python, so large batches are sharded across
+worker processes, each with its analyzers loaded once, in chunks that
+amortize the IPC cost
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_worker_analyzer = None
+
+def _init_sentiment_worker():
+    """Build one analyzer per worker process and load the TextBlob corpora up front"""
+    global _worker_analyzer
+    from sentiment_analyzer import SentimentAnalyzer
+    from sentiment_cache import SentimentCache
+
+    _worker_analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+    _worker_analyzer.analyze_with_textblob("warm up")
+
+def _score_texts(analyzer, texts: List[str], methods: Tuple[str, ...]) -> List[Tuple[Dict, Dict]]:
+    """(textblob, vader) per text, methods left out get their neutral result"""
+    return [
+        (analyzer.analyze_with_textblob(text if 'textblob' in methods else ""),
+         analyzer.analyze_with_vader(text if 'vader' in methods else ""))
+        for text in texts
+    ]
+
+def _score_chunk(texts: List[str], methods: Tuple[str, ...]) -> List[Tuple[Dict, Dict]]:
+    return _score_texts(_worker_analyzer, texts, methods)
+
+class LexiconPool:
+    """
+    Score cleaned texts with TextBlob and VADER on a process pool
+
+    Batches smaller than min_texts are scored in the calling process, where
+    the IPC round trip would cost more than it saves.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                 min_texts: Optional[int] = None):
+        self.workers = workers or Config.SENTIMENT_WORKERS
+        self.chunk_size = chunk_size or Config.SENTIMENT_CHUNK_SIZE
+        self.min_texts = Config.SENTIMENT_POOL_MIN_TEXTS if min_texts is None else min_texts
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_sentiment_worker
+                )
+            return self._executor
+
+    def score(self, analyzer, texts: List[str], methods: Tuple[str, ...] = ('vader', 'textblob')) -> List[Tuple[Dict, Dict]]:
+        """(textblob, vader) results for each text, in input order"""
+        if self.workers <= 1 or len(texts) < self.min_texts:
+            return _score_texts(analyzer, texts, methods)
+
+        chunks = [texts[start:start + self.chunk_size] for start in range(0, len(texts), self.chunk_size)]
+        try:
+            results = []
+            for chunk_results in self._get_executor().map(_score_chunk, chunks, [methods] * len(chunks)):
+                results.extend(chunk_results)
+            return results
+        except Exception as e:
+            logger.error(f"Sentiment worker pool failed, scoring in process: {e}")
+            self.shutdown()
+            return _score_texts(analyzer, texts, methods)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+_lexicon_pool = None
+_lexicon_pool_lock = threading.Lock()
+
+def get_lexicon_pool() -> LexiconPool:
+    """Process-wide lexicon pool, worker processes start on first large batch"""
+    global _lexicon_pool
+    with _lexicon_pool_lock:
+        if _lexicon_pool is None:
+            _lexicon_pool = LexiconPool()
+        return _lexicon_pool
+
+def close_lexicon_pool():
+    with _lexicon_pool_lock:
+        if _lexicon_pool is not None:
+            _lexicon_pool.shutdown()
@@ -1,19 +1,39 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, or_, desc, func, select, update
+from typing import List, Optional, Dict, Any, Iterable, Iterator
+from itertools import islice
 from datetime import datetime, timedelta
+import time
+import threading
 import logging
 
-from models import Stock, NewsArticle
+from config import Config
+from models import Stock, NewsArticle, NewsArticleSymbol, NewsWatermark
 from scraper import FinvizScraper
+from parse_pipeline import QuotePipeline
+from screener import FinvizScreener
+from symbol_registry import symbol_registry
+from headline_tagger import headline_tagger
 from sentiment_analyzer import sentiment_analyzer
 
 logger = logging.getLogger(__name__)
 
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items without materializing it"""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def article_symbol_filter(symbol: str):
+    """Filter matching articles scraped for symbol or tagged with it"""
+    symbol = symbol.upper()
+    tagged_ids = select(NewsArticleSymbol.article_id).where(NewsArticleSymbol.symbol == symbol)
+    return or_(NewsArticle.stock_symbol == symbol, NewsArticle.id.in_(tagged_ids))
+
 class StockService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, scraper: Optional[FinvizScraper] = None):
         self.db = db
-        self.scraper = FinvizScraper()
+        self.scraper = scraper or FinvizScraper()
     
     def get_all_stocks(self, limit: int = 100, offset: int = 0) -> List[Stock]:
         """Get all stocks with pagination"""
@@ -26,12 +46,16 @@ class StockService:
     def search_stocks(self, query: str, limit: int = 20) -> List[Stock]:
         """Search stocks by symbol or name"""
         search_term = f"%{query.upper()}%"
-        return self.db.query(Stock).filter(
-            or_(
-                Stock.symbol.like(search_term),
-                Stock.name.like(f"%{query}%")
-            )
-        ).limit(limit).all()
+        conditions = [
+            Stock.symbol.like(search_term),
+            Stock.name.like(f"%{query}%")
+        ]
+        
+        known_symbols = symbol_registry.search(query, limit=limit)
+        if known_symbols:
+            conditions.append(Stock.symbol.in_(known_symbols))
+        
+        return self.db.query(Stock).filter(or_(*conditions)).limit(limit).all()
     
     def get_stocks_by_sector(self, sector: str, limit: int = 50) -> List[Stock]:
         """Get stocks by sector"""
@@ -66,37 +90,82 @@ class StockService:
             return new_stock
     
     def scrape_and_save_stock(self, symbol: str) -> Optional[Stock]:
-        """Scrape stock data and save to database"""
+        """Scrape stock data and save to database, storing the page's news from the same fetch"""
+        result = self.scrape_and_save_quote(symbol)
+        if not result['stock_updated']:
+            return None
+        return self.get_stock(symbol)
+    
+    def scrape_and_save_quote(self, symbol: str) -> Dict[str, Any]:
+        """Scrape the quote page once and save both stock data and news"""
         try:
-            stock_data = self.scraper.get_stock_data(symbol)
+            news_service = NewsService(self.db, scraper=self.scraper)
+            watermark = news_service.get_watermarks([symbol]).get(symbol.upper())
+            quote = self.scraper.scrape_quote(symbol, watermark)
+            
+            stock = None
+            if quote['stock']:
+                stock = self.create_or_update_stock(quote['stock'])
+            
+            saved_count = news_service.save_new_articles(symbol, quote['news'])
+            
+            result = {
+                'symbol': symbol.upper(),
+                'stock_updated': stock is not None,
+                'news_scraped': len(quote['news']),
+                'news_saved': saved_count
+            }
+            if 'error' in quote:
+                result['error'] = quote['error']
+            return result
             
-            if stock_data:
-                return self.create_or_update_stock(stock_data)
-            else:
-                return None
-                
         except Exception as e:
-
-                
-            pass
-            return None
+            return {
+                'symbol': symbol.upper(),
+                'stock_updated': False,
+                'news_scraped': 0,
+                'news_saved': 0,
+                'error': str(e)
+            }
     
     def bulk_scrape_stocks(self, symbols: List[str]) -> Dict[str, Any]:
-        """Bulk scrape multiple stocks"""
+        """
+        Bulk scrape multiple stocks
+        Fundamentals come from screener pages, symbols the screener does not
+        list fall back to their individual quote pages
+        """
         results = {
             'successful': [],
             'failed': [],
-            'total': len(symbols)
+            'total': len(symbols),
+            'news_saved': 0
         }
         
-        for symbol in symbols:
+        for symbol, stock_data in FinvizScreener(scraper=self.scraper).iter_stocks_data(symbols):
             try:
-                stock = self.scrape_and_save_stock(symbol)
-                if stock:
+                self.create_or_update_stock(stock_data)
+                results['successful'].append(symbol)
+            except Exception as e:
+                self.db.rollback()
+                results['failed'].append(symbol)
+        
+        done = set(results['successful']) | set(results['failed'])
+        missing = [symbol for symbol in dict.fromkeys(s.upper() for s in symbols) if symbol not in done]
+        if not missing:
+            return results
+        
+        news_service = NewsService(self.db, scraper=self.scraper)
+        watermarks = news_service.get_watermarks(missing)
+        
+        for symbol, quote in QuotePipeline(scraper=self.scraper).iter_quotes(missing, watermarks):
+            try:
+                if quote['stock'] and self.create_or_update_stock(quote['stock']):
                     results['successful'].append(symbol)
                 else:
                     results['failed'].append(symbol)
+                results['news_saved'] += news_service.save_new_articles(symbol, quote['news'])
             except Exception as e:
+                self.db.rollback()
                 results['failed'].append(symbol)
         
         return results
@@ -128,16 +197,16 @@ class StockService:
         }
 
 class NewsService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, scraper: Optional[FinvizScraper] = None):
         self.db = db
-        self.scraper = FinvizScraper()
+        self.scraper = scraper or FinvizScraper()
     
     def get_news(self, symbol: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[NewsArticle]:
         """Get news articles with optional symbol filter"""
         query = self.db.query(NewsArticle)
         
         if symbol:
-            query = query.filter(NewsArticle.stock_symbol == symbol.upper())
+            query = query.filter(article_symbol_filter(symbol))
         
         return query.order_by(desc(NewsArticle.published_date)).offset(offset).limit(limit).all()
     
@@ -152,7 +221,7 @@ class NewsService:
     def get_news_by_symbol(self, symbol: str, limit: int = 20) -> List[NewsArticle]:
         """Get news for specific symbol"""
         return self.db.query(NewsArticle).filter(
-            NewsArticle.stock_symbol == symbol.upper()
+            article_symbol_filter(symbol)
         ).order_by(desc(NewsArticle.published_date)).limit(limit).all()
     
     def create_or_update_news(self, news_data: Dict[str, Any]) -> NewsArticle:
@@ -161,37 +230,47 @@ class NewsService:
             NewsArticle.link == news_data.get('link')
         ).first()
         
+        article = self._stage_news(news_data, existing_article)
+        self.db.commit()
+        self.db.refresh(article)
+        return article
+    
+    def _stage_news(self, news_data: Dict[str, Any], existing_article: Optional[NewsArticle]) -> NewsArticle:
+        """Add or update an article in the session without committing"""
         if existing_article:
             for key, value in news_data.items():
-                if hasattr(existing_article, key) and value is not None:
+                if key != 'stock_symbol' and hasattr(existing_article, key) and value is not None:
                     setattr(existing_article, key, value)
-            self.db.commit()
+            self.tag_article(existing_article, news_data.get('stock_symbol'))
             return existing_article
         else:
             new_article = NewsArticle(**news_data)
+            self.tag_article(new_article)
             self.db.add(new_article)
-            self.db.commit()
-            self.db.refresh(new_article)
             return new_article
     
-    def analyze_article_sentiment(self, article: NewsArticle) -> NewsArticle:
+    def tag_article(self, article: NewsArticle, scraped_symbol: Optional[str] = None) -> None:
+        """Associate an article with every symbol mentioned in its headline"""
+        symbols = headline_tagger.tag(article.title)
+        for symbol in (article.stock_symbol, scraped_symbol):
+            if symbol and symbol.upper() not in symbols:
+                symbols.append(symbol.upper())
+        
+        existing = {link.symbol for link in article.symbols}
+        for symbol in symbols:
+            if symbol not in existing:
+                article.symbols.append(NewsArticleSymbol(symbol=symbol))
+    
+    def analyze_article_sentiment(self, article: NewsArticle, mode: Optional[str] = None) -> NewsArticle:
         """Analyze sentiment for a single article"""
         try:
             sentiment_data = sentiment_analyzer.analyze_article(
                 title=article.title,
-                summary=article.summary or ""
+                summary=article.summary or "",
+                mode=mode
             )
             
-            article.sentiment_score = sentiment_data['sentiment_score']
-            article.sentiment_label = sentiment_data['sentiment_label']
-            article.sentiment_confidence = sentiment_data['sentiment_confidence']
-            article.textblob_polarity = sentiment_data['textblob_polarity']
-            article.textblob_subjectivity = sentiment_data['textblob_subjectivity']
-            article.vader_compound = sentiment_data['vader_compound']
-            article.vader_positive = sentiment_data['vader_positive']
-            article.vader_negative = sentiment_data['vader_negative']
-            article.vader_neutral = sentiment_data['vader_neutral']
-            article.sentiment_analyzed_at = datetime.now()
+            self.apply_sentiment(article, sentiment_data)
             
             self.db.commit()
             
@@ -200,33 +279,144 @@ class NewsService:
         
         return article
     
-    def analyze_news_sentiment(self, symbol: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
-        """Analyze sentiment for news articles"""
-        try:
-            query = self.db.query(NewsArticle).filter(
-                NewsArticle.sentiment_score.is_(None)
-            )
-            
-            if symbol:
-                query = query.filter(NewsArticle.stock_symbol == symbol.upper())
-            
-            articles = query.limit(limit).all()
-            
-            analyzed_count = 0
-            for article in articles:
-                self.analyze_article_sentiment(article)
-                analyzed_count += 1
-            
-            return {
-                'analyzed_count': analyzed_count,
-                'symbol': symbol or 'all',
-                'status': 'completed'
+    def apply_sentiment(self, article: NewsArticle, sentiment_data: Dict[str, Any]) -> None:
+        """Copy sentiment analysis results onto an article without committing"""
+        for column, value in self.sentiment_columns(sentiment_data).items():
+            setattr(article, column, value)
+    
+    def sentiment_columns(self, sentiment_data: Dict[str, Any], analyzed_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """NewsArticle column values for a sentiment analysis result"""
+        return {
+            'sentiment_score': sentiment_data['sentiment_score'],
+            'sentiment_label': sentiment_data['sentiment_label'],
+            'sentiment_confidence': sentiment_data['sentiment_confidence'],
+            'sentiment_mode': sentiment_data.get('sentiment_mode'),
+            'textblob_polarity': sentiment_data['textblob_polarity'],
+            'textblob_subjectivity': sentiment_data['textblob_subjectivity'],
+            'vader_compound': sentiment_data['vader_compound'],
+            'vader_positive': sentiment_data['vader_positive'],
+            'vader_negative': sentiment_data['vader_negative'],
+            'vader_neutral': sentiment_data['vader_neutral'],
+            'sentiment_analyzed_at': analyzed_at or datetime.now()
+        }
+    
+    def save_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """
+        Create or update a list of scraped articles, returning how many were saved
+        Each article is flushed in its own savepoint and the batch is committed once
+        """
+        links = [article_data.get('link') for article_data in articles]
+        existing = {}
+        if links:
+            existing = {
+                article.link: article
+                for article in self.db.query(NewsArticle).filter(NewsArticle.link.in_(links))
             }
-            
-        except Exception as e:
+        
+        saved_count = 0
+        for article_data in articles:
+            try:
+                with self.db.begin_nested():
+                    article = self._stage_news(article_data, existing.get(article_data.get('link')))
+                existing[article.link] = article
+                saved_count += 1
+            except Exception as e:
+                continue
+        
+        self.db.commit()
+        return saved_count
+    
+    def get_watermarks(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Newest stored article per symbol, used to stop news parsing early"""
+        symbols = [symbol.upper() for symbol in symbols]
+        watermarks = self.db.query(NewsWatermark).filter(NewsWatermark.symbol.in_(symbols)).all()
+        
+        return {
+            watermark.symbol: {
+                'last_link': watermark.last_link,
+                'last_published_date': watermark.last_published_date
+            }
+            for watermark in watermarks
+        }
+    
+    def advance_watermark(self, symbol: str, articles: List[Dict[str, Any]]) -> None:
+        """Move a symbol's watermark to the newest of freshly saved articles"""
+        if not articles:
+            return
+        
+        symbol = symbol.upper()
+        watermark = self.db.get(NewsWatermark, symbol) or NewsWatermark(symbol=symbol)
+        
+        watermark.last_link = articles[0]['link']
+        dates = [article['published_date'] for article in articles if article.get('published_date')]
+        if dates and (not watermark.last_published_date or max(dates) > watermark.last_published_date):
+            watermark.last_published_date = max(dates)
+        
+        self.db.add(watermark)
+        self.db.commit()
+    
+    def save_new_articles(self, symbol: str, articles: List[Dict[str, Any]]) -> int:
+        """Save articles parsed past a symbol's watermark and advance it when all were stored"""
+        saved_count = self.save_articles(articles)
+        if saved_count == len(articles):
+            self.advance_watermark(symbol, articles)
+        return saved_count
+    
+    def ingest_articles(self, articles: Iterable[Dict[str, Any]], batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Save a stream of scraped articles in fixed-size batches
 
+        Articles must arrive newest first per symbol. Each symbol's watermark
+        advances once the stream is drained, unless one of its batches failed.
+        """
+        batch_size = batch_size or Config.INGEST_BATCH_SIZE
+        newest: Dict[str, Dict[str, Any]] = {}
+        incomplete = set()
+        scraped_count = 0
+        saved_count = 0
+        
+        for batch in batched(articles, batch_size):
+            batch_saved = self.save_articles(batch)
+            scraped_count += len(batch)
+            saved_count += batch_saved
             
-            pass
+            symbols = {article['stock_symbol'].upper() for article in batch}
+            for article in batch:
+                newest.setdefault(article['stock_symbol'].upper(), article)
+            if batch_saved < len(batch):
+                incomplete.update(symbols)
+        
+        for symbol, article in newest.items():
+            if symbol not in incomplete:
+                self.advance_watermark(symbol, [article])
+        
+        return {'scraped': scraped_count, 'saved': saved_count}
+    
+    def scrape_new_news(self, symbol: str, max_pages: int = 5) -> Dict[str, Any]:
+        """
+        Scrape only the news newer than the symbol's watermark and save it
+        The quote page is fetched once, so its stock data is saved as well
+        """
+        quote = StockService(self.db, scraper=self.scraper).scrape_and_save_quote(symbol)
+        
+        result = {
+            'symbol': quote['symbol'],
+            'scraped': quote['news_scraped'],
+            'saved': quote['news_saved'],
+            'stock_updated': quote['stock_updated']
+        }
+        if 'error' in quote:
+            result['error'] = quote['error']
+        return result
+    
+    def analyze_news_sentiment(self, symbol: Optional[str] = None, limit: int = 100,
+                               mode: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze sentiment for up to limit unanalyzed news articles"""
+        try:
+            return self.analyze_backlog(symbol, mode, max_articles=limit)
+            
+        except Exception as e:
+            self.db.rollback()
             return {
                 'analyzed_count': 0,
                 'symbol': symbol or 'all',
@@ -234,13 +424,81 @@ class NewsService:
                 'error': str(e)
             }
     
+    def analyze_backlog(self, symbol: Optional[str] = None, mode: Optional[str] = None,
+                        batch_size: Optional[int] = None, max_articles: Optional[int] = None,
+                        stop: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Score unanalyzed articles batch by batch until none are left
+        
+        Articles are read in id order with keyset pagination, scored with one
+        batched analyzer call per batch and written back with a single bulk
+        UPDATE and commit per batch. Articles added while the backlog drains
+        are picked up as long as their ids are ahead of the cursor.
+        
+        Each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED until its
+        commit, so several workers running the stage score disjoint batches.
+        """
+        mode = sentiment_analyzer.resolve_mode(mode)
+        batch_size = batch_size or Config.SENTIMENT_BACKLOG_BATCH_SIZE
+        
+        started = time.monotonic()
+        last_id = 0
+        analyzed_count = 0
+        escalated_count = 0
+        batches = 0
+        
+        while max_articles is None or analyzed_count < max_articles:
+            if stop is not None and stop.is_set():
+                break
+            
+            size = batch_size if max_articles is None else min(batch_size, max_articles - analyzed_count)
+            query = self.db.query(NewsArticle.id, NewsArticle.title, NewsArticle.summary).filter(
+                NewsArticle.sentiment_score.is_(None),
+                NewsArticle.id > last_id
+            )
+            if symbol:
+                query = query.filter(article_symbol_filter(symbol))
+            rows = query.order_by(NewsArticle.id).limit(size).with_for_update(skip_locked=True).all()
+            if not rows:
+                break
+            
+            results = sentiment_analyzer.analyze_articles(
+                [(title, summary or "") for _, title, summary in rows],
+                mode=mode
+            )
+            
+            analyzed_at = datetime.now()
+            self.db.execute(update(NewsArticle), [
+                {'id': article_id, **self.sentiment_columns(result, analyzed_at)}
+                for (article_id, _, _), result in zip(rows, results)
+            ])
+            self.db.commit()
+            
+            last_id = rows[-1].id
+            batches += 1
+            analyzed_count += len(rows)
+            escalated_count += sum(1 for result in results if result.get('sentiment_escalated'))
+            logger.info(f"Sentiment backlog: {analyzed_count} articles in {time.monotonic() - started:.1f}s")
+        
+        elapsed = time.monotonic() - started
+        return {
+            'analyzed_count': analyzed_count,
+            'escalated_count': escalated_count,
+            'batches': batches,
+            'seconds': round(elapsed, 2),
+            'articles_per_second': round(analyzed_count / elapsed, 1) if elapsed > 0 else 0.0,
+            'symbol': symbol or 'all',
+            'mode': mode,
+            'status': 'completed'
+        }
+    
     def get_stock_sentiment_summary(self, symbol: str, days_back: int = 7) -> Dict[str, Any]:
         """Get sentiment summary for a specific stock"""
         try:
             cutoff_date = datetime.now() - timedelta(days=days_back)
             
             articles = self.db.query(NewsArticle).filter(
-                NewsArticle.stock_symbol == symbol.upper(),
+                article_symbol_filter(symbol),
                 NewsArticle.published_date >= cutoff_date,
                 NewsArticle.sentiment_score.isnot(None)
             ).all()
@@ -293,25 +551,17 @@ class NewsService:
         """Scrape news and save to database"""
         try:
             if symbol:
-                articles = self.scraper.get_news_for_stock(symbol, max_pages=5)
-            else:
-                popular_symbols = self.scraper.get_popular_stocks()
-                articles = []
-                for sym in popular_symbols[:10]:
-                    articles.extend(self.scraper.get_news_for_stock(sym, max_pages=2))
+                return self.scrape_new_news(symbol)
+            
+            popular_symbols = self.scraper.get_popular_stocks()[:10]
+            watermarks = self.get_watermarks(popular_symbols)
             
-            saved_count = 0
-            for article_data in articles:
-                try:
-                    self.create_or_update_news(article_data)
-                    saved_count += 1
-                except Exception as e:
-                    continue
+            articles = QuotePipeline(scraper=self.scraper).iter_news(popular_symbols, watermarks)
+            counts = self.ingest_articles(articles)
             
             return {
-                'scraped': len(articles),
-                'saved': saved_count,
-                'symbol': symbol or 'multiple'
+                **counts,
+                'symbol': 'multiple'
             }
             
         except Exception as e:
@@ -0,0 +1,279 @@
+"""
+Registry of known stock symbols and their company name aliases
+Built once at import from sp500_data.SP500_COMPANIES and shared by the
+scraper, the services and the populate script
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sp500_data import SP500_COMPANIES
+
+# Corporate designators dropped from the end of a company name to derive its alias
+LEGAL_SUFFIXES = {
+    'INC', 'INCORPORATED', 'CORPORATION', 'CORP', 'COMPANY', 'COMPANIES', 'CO',
+    'PLC', 'LTD', 'LIMITED', 'HOLDINGS', 'HOLDING', 'GROUP', 'LP', 'NV', 'SA', 'AG', 'SE',
+}
+
+TRAILING_PHRASES = re.compile(
+    r'(\s+CLASS\s+[A-C]|\s+PUBLIC LIMITED COMPANY|\s+NATIONAL ASSOCIATION|[\s,&]+|\s+AND|\s+OF|\s+THE)$'
+)
+
+# Generic business words that headlines usually leave out ("Cisco" for "Cisco Systems")
+DESCRIPTIVE_SUFFIXES = {
+    'INTERNATIONAL', 'TECHNOLOGIES', 'TECHNOLOGY', 'SYSTEMS', 'SOLUTIONS', 'LABORATORIES',
+    'WORLDWIDE', 'COMMUNICATIONS', 'INDUSTRIES', 'PLATFORMS', 'SCIENCES', 'MOTOR', 'FINANCIAL',
+}
+
+# Well-known names that can't be derived from the legal name
+EXTRA_ALIASES = {
+    'AAPL': ['APPLE'],
+    'MSFT': ['MICROSOFT'],
+    'GOOGL': ['GOOGLE', 'ALPHABET'],
+    'AMZN': ['AMAZON'],
+    'TSLA': ['TESLA'],
+    'META': ['FACEBOOK', 'META'],
+    'NVDA': ['NVIDIA'],
+    'NFLX': ['NETFLIX'],
+    'AMD': ['ADVANCED MICRO DEVICES'],
+    'INTC': ['INTEL'],
+    'CRM': ['SALESFORCE'],
+    'ORCL': ['ORACLE'],
+    'ADBE': ['ADOBE'],
+    'PYPL': ['PAYPAL'],
+    'UBER': ['UBER'],
+    'LYFT': ['LYFT'],
+    'SQ': ['SQUARE', 'BLOCK'],
+    'ROKU': ['ROKU'],
+    'ZM': ['ZOOM'],
+    'DOCU': ['DOCUSIGN'],
+    'SNOW': ['SNOWFLAKE'],
+    'PLTR': ['PALANTIR'],
+    'COIN': ['COINBASE'],
+    'HOOD': ['ROBINHOOD'],
+    'SPOT': ['SPOTIFY'],
+    'TWTR': ['TWITTER'],
+    'SNAP': ['SNAPCHAT'],
+    'PINS': ['PINTEREST'],
+    'SHOP': ['SHOPIFY'],
+    'ABNB': ['AIRBNB'],
+    'DDOG': ['DATADOG'],
+    'NET': ['CLOUDFLARE'],
+    'OKTA': ['OKTA'],
+    'CRWD': ['CROWDSTRIKE'],
+    'ZS': ['ZSCALER'],
+    'PANW': ['PALO ALTO'],
+    'FTNT': ['FORTINET'],
+    'CHKP': ['CHECK POINT'],
+    'CYBR': ['CYBERARK'],
+    'SAIL': ['SAILPOINT'],
+    'ESTC': ['ELASTIC'],
+    'MDB': ['MONGODB'],
+    'DIS': ['DISNEY'],
+    'NKE': ['NIKE'],
+    'SBUX': ['STARBUCKS'],
+    'MCD': ['MCDONALDS'],
+    'KO': ['COCA COLA'],
+    'PEP': ['PEPSICO'],
+    'WMT': ['WALMART'],
+    'TGT': ['TARGET'],
+    'HD': ['HOME DEPOT'],
+    'LOW': ['LOWES'],
+    'COST': ['COSTCO'],
+    'AMAT': ['APPLIED MATERIALS'],
+    'LRCX': ['LAM RESEARCH'],
+    'KLAC': ['KLA'],
+    'MU': ['MICRON'],
+    'QCOM': ['QUALCOMM'],
+    'AVGO': ['BROADCOM'],
+    'TXN': ['TEXAS INSTRUMENTS'],
+    'ADI': ['ANALOG DEVICES'],
+    'MRVL': ['MARVELL'],
+    'SWKS': ['SKYWORKS'],
+    'QRVO': ['QORVO'],
+    'CRUS': ['CIRRUS LOGIC'],
+    'SLAB': ['SILICON LABS'],
+    'MCHP': ['MICROCHIP'],
+    'ON': ['ON SEMICONDUCTOR'],
+    'MPWR': ['MONOLITHIC POWER'],
+    'POWI': ['POWER INTEGRATIONS'],
+    'DIOD': ['DIODES'],
+    'ALGM': ['ALLEGRO'],
+    'IMOS': ['CHIPMOS'],
+    'UMC': ['UNITED MICROELECTRONICS'],
+    'TSM': ['TAIWAN SEMICONDUCTOR'],
+    'ASML': ['ASML'],
+    'NXPI': ['NXP'],
+    'STM': ['ST MICROELECTRONICS'],
+    'INFN': ['INFINERA'],
+    'LITE': ['LUMENTUM'],
+    'ACIA': ['ACACIA'],
+    'COHR': ['COHERENT'],
+    'IIVI': ['II VI'],
+    'NPTN': ['NEOPHOTONICS'],
+    'AAOI': ['APPLIED OPTOELECTRONICS'],
+    'OCCL': ['OPTICAL CABLE'],
+    'EMAN': ['EMANATION'],
+    'FNSR': ['FINISAR'],
+    'OCLR': ['OCLARO'],
+    'PXLW': ['PIXELWORKS'],
+    'RPXC': ['RPX'],
+    'SMTC': ['SEMTECH'],
+    'SITM': ['SITIME'],
+    'SYNA': ['SYNAPTICS'],
+    'XLNX': ['XILINX']
+}
+
+def normalize_name(name: str) -> str:
+    """Uppercase a company name and collapse whitespace"""
+    return re.sub(r'\s+', ' ', name.upper()).strip()
+
+def derive_aliases(name: str) -> List[str]:
+    """Derive headline aliases from a legal company name"""
+    base = normalize_name(name)
+    dot_com = '.COM' in base
+    base = base.replace('.COM', '').replace('.', '')
+    if base.startswith('THE '):
+        base = base[4:]
+
+    while True:
+        stripped = TRAILING_PHRASES.sub('', base)
+        words = stripped.split(' ')
+        if len(words) > 1 and words[-1].rstrip(',') in LEGAL_SUFFIXES:
+            stripped = ' '.join(words[:-1])
+        if stripped == base:
+            break
+        base = stripped
+
+    candidates = [base]
+    if dot_com:
+        candidates.insert(0, base + '.COM')
+
+    words = base.split(' ')
+    if len(words) > 1 and words[-1] in DESCRIPTIVE_SUFFIXES:
+        candidates.append(' '.join(words[:-1]))
+
+    if "'" in base:
+        candidates.append(base.replace("'", ''))
+    if '-' in base:
+        candidates.append(base.replace('-', ' '))
+
+    aliases = []
+    for alias in candidates:
+        if len(alias) >= 2 and alias not in aliases:
+            aliases.append(alias)
+    return aliases
+
+def build_matcher(terms: List[str]) -> re.Pattern:
+    """Compile one word-bounded pattern matching any of the terms"""
+    ordered = sorted(set(terms), key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in ordered) + r')\b')
+
+class SymbolEntry:
+    """A known symbol with its company name, aliases and compiled headline matcher"""
+
+    __slots__ = ('symbol', 'name', 'aliases', 'matcher')
+
+    def __init__(self, symbol: str, name: str, aliases: List[str]):
+        self.symbol = symbol
+        self.name = name
+        self.aliases = tuple(aliases)
+        self.matcher = build_matcher([symbol] + aliases)
+
+    @property
+    def search_terms(self) -> List[str]:
+        return [self.symbol] + list(self.aliases)
+
+    def __repr__(self):
+        return f"<SymbolEntry(symbol='{self.symbol}', aliases={list(self.aliases)})>"
+
+class SymbolRegistry:
+    """
+    Symbol and company name lookups with precompiled headline matchers
+    """
+
+    def __init__(self, companies: List[Tuple[str, str]], extra_aliases: Optional[Dict[str, List[str]]] = None):
+        self._by_symbol: Dict[str, SymbolEntry] = {}
+        self._by_alias: Dict[str, List[str]] = {}
+
+        extra_aliases = extra_aliases or {}
+
+        for symbol, name in companies:
+            self._add(symbol.upper(), name, derive_aliases(name) + extra_aliases.get(symbol.upper(), []))
+
+        for symbol, aliases in extra_aliases.items():
+            if symbol not in self._by_symbol:
+                self._add(symbol, '', list(aliases))
+
+    def _add(self, symbol: str, name: str, aliases: List[str]):
+        unique_aliases = []
+        for alias in aliases:
+            if alias not in unique_aliases:
+                unique_aliases.append(alias)
+
+        entry = SymbolEntry(symbol, name, unique_aliases)
+        self._by_symbol[symbol] = entry
+
+        keys = set(unique_aliases)
+        if name:
+            keys.add(normalize_name(name))
+        for key in keys:
+            self._by_alias.setdefault(key, []).append(symbol)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._by_symbol
+
+    def __iter__(self) -> Iterator[SymbolEntry]:
+        return iter(self._by_symbol.values())
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def get(self, symbol: str) -> Optional[SymbolEntry]:
+        """Look up a symbol"""
+        return self._by_symbol.get(symbol.upper())
+
+    def lookup_name(self, name: str) -> List[str]:
+        """Symbols whose company name or alias is exactly name"""
+        return list(self._by_alias.get(normalize_name(name), []))
+
+    def matcher(self, symbol: str) -> re.Pattern:
+        """Compiled headline matcher for a symbol, including unknown symbols"""
+        entry = self.get(symbol)
+        if entry:
+            return entry.matcher
+        return _symbol_only_matcher(symbol.upper())
+
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """Symbols matching a query by symbol, exact alias or company name substring"""
+        query_upper = normalize_name(query)
+        if not query_upper:
+            return []
+
+        results = []
+        if query_upper in self._by_symbol:
+            results.append(query_upper)
+        for symbol in self._by_alias.get(query_upper, []):
+            if symbol not in results:
+                results.append(symbol)
+
+        for entry in self._by_symbol.values():
+            if len(results) >= limit:
+                break
+            if entry.symbol in results:
+                continue
+            if entry.symbol.startswith(query_upper) or query_upper in normalize_name(entry.name):
+                results.append(entry.symbol)
+
+        return results[:limit]
+
+    def companies(self) -> List[Tuple[str, str]]:
+        """Known (symbol, company name) pairs, skipping alias-only entries"""
+        return [(entry.symbol, entry.name) for entry in self._by_symbol.values() if entry.name]
+
+@lru_cache(maxsize=256)
+def _symbol_only_matcher(symbol: str) -> re.Pattern:
+    return build_matcher([symbol])
+
+symbol_registry = SymbolRegistry(SP500_COMPANIES, EXTRA_ALIASES)
@@ -0,0 +1,58 @@
+"""
+Test script for multi-ticker headline tagging
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from headline_tagger import AhoCorasick, headline_tagger
+from symbol_registry import symbol_registry
+
+def test_automaton_finds_overlapping_patterns():
+    """Every occurrence is reported, including patterns inside other patterns"""
+    automaton = AhoCorasick({'HE': [1], 'SHE': [2], 'HERS': [3]})
+
+    matches = sorted((start, pattern) for start, _, pattern, _ in automaton.iter_matches('USHERS'))
+
+    assert matches == [(1, 'SHE'), (2, 'HE'), (2, 'HERS')]
+
+def test_tags_every_mentioned_symbol():
+    """Aliases and tickers for several companies are found in one headline"""
+    assert headline_tagger.tag("Microsoft and Apple & the AI race") == ['MSFT', 'AAPL']
+    assert headline_tagger.tag("Amazon.com beats; NVDA falls") == ['AMZN', 'NVDA']
+
+def test_respects_word_boundaries_and_ticker_case():
+    """Substrings and lower-case ticker lookalikes are not tagged"""
+    assert headline_tagger.tag("Pineapple prices rise") == []
+    assert headline_tagger.tag("Now is the time; it's all low cost") == []
+    assert headline_tagger.tag("nvda mention in lower case") == []
+
+def test_ignores_company_names_used_as_ordinary_words():
+    """Aliases that double as everyday words don't tag unrelated headlines"""
+    assert headline_tagger.tag("Analyst raises price target on Apple") == ['AAPL']
+    assert headline_tagger.tag("Dow futures slip ahead of CPI") == []
+    assert headline_tagger.tag("Booking a trip? Airfares jump") == []
+    assert headline_tagger.tag("TGT and DOW rally after earnings") == ['TGT', 'DOW']
+
+def test_symbol_matchers_keep_ambiguous_aliases():
+    """A symbol's own news page still keeps headlines naming the company by an everyday word"""
+    assert symbol_registry.matcher('TGT').search("Target raises guidance".upper())
+    assert symbol_registry.matcher('V').search("Visa volumes climb".upper())
+    assert symbol_registry.matcher('DOW').search("Dow cuts capex".upper())
+
+def main():
+    """Main test function"""
+
+    test_automaton_finds_overlapping_patterns()
+    test_tags_every_mentioned_symbol()
+    test_respects_word_boundaries_and_ticker_case()
+    test_ignores_company_names_used_as_ordinary_words()
+    test_symbol_matchers_keep_ambiguous_aliases()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
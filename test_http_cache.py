@@ -0,0 +1,104 @@
+"""
+Test script for the on-disk HTTP response cache
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachingHTTPAdapter, ResponseCache
+
+URL = 'https://finviz.com/quote.ashx?t=AAPL'
+
+class StubTransport(HTTPAdapter):
+    """Answers every request with the next queued (status, headers, body) and records the request headers"""
+
+    def __init__(self, *args, **kwargs):
+        self.replies = []
+        self.sent = []
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        self.sent.append(dict(request.headers))
+        status, headers, body = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+class StubCachingAdapter(CachingHTTPAdapter, StubTransport):
+    pass
+
+def make_session(cache: ResponseCache, ttl: int) -> requests.Session:
+    session = requests.Session()
+    session.mount('https://', StubCachingAdapter(cache=cache, ttl_rules=[], default_ttl=ttl))
+    return session
+
+def test_fresh_responses_are_served_from_disk():
+    """A stored response is returned without another request until it expires"""
+    with tempfile.TemporaryDirectory() as directory:
+        session = make_session(ResponseCache(directory, 1024), ttl=60)
+        adapter = session.get_adapter(URL)
+        adapter.replies.append((200, {'Content-Type': 'text/html'}, b'page'))
+
+        first = session.get(URL)
+        second = session.get(URL)
+
+        assert not first.from_cache and second.from_cache
+        assert second.content == b'page'
+        assert len(adapter.sent) == 1
+
+def test_stale_entries_revalidate_with_lower_case_validators():
+    """Validators sent in any header case are replayed and a 304 reuses the stored body"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(directory, 1024)
+        session = make_session(cache, ttl=0)
+        adapter = session.get_adapter(URL)
+        adapter.replies.append((200, {'etag': '"v1"', 'last-modified': 'Wed, 15 Oct 2025 12:00:00 GMT'}, b'page'))
+        adapter.replies.append((304, {}, b''))
+
+        session.get(URL)
+        revalidated = session.get(URL)
+
+        assert adapter.sent[1]['If-None-Match'] == '"v1"'
+        assert adapter.sent[1]['If-Modified-Since'] == 'Wed, 15 Oct 2025 12:00:00 GMT'
+        assert revalidated.from_cache and revalidated.content == b'page'
+        assert cache.get(URL)['expires_at'] <= time.time() + 1
+
+def test_least_recently_used_entries_are_evicted():
+    """Entries over the size bound are dropped oldest access first"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(directory, 10)
+
+        cache.put('a', 200, {}, b'aaaa', time.time() + 60)
+        cache.put('b', 200, {}, b'bbbb', time.time() + 60)
+        time.sleep(0.01)
+        cache.get('a')
+        cache.put('c', 200, {}, b'cccc', time.time() + 60)
+        cache.put('huge', 200, {}, b'x' * 11, time.time() + 60)
+
+        assert cache.get('b') is None and cache.get('huge') is None
+        assert cache.get('a')['body'] == b'aaaa'
+        assert cache.get('c')['body'] == b'cccc'
+
+def main():
+    """Main test function"""
+
+    test_fresh_responses_are_served_from_disk()
+    test_stale_entries_revalidate_with_lower_case_validators()
+    test_least_recently_used_entries_are_evicted()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
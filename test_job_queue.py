@@ -0,0 +1,78 @@
+"""
+Test script for job queue leases
+"""
+
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import job_queue
+from job_queue import complete, dequeue, enqueue, fail, run_job
+from models import Base, Job
+
+def make_session_factory(directory: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, 'jobs.sqlite')}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+def test_stale_worker_cannot_overwrite_new_owner():
+    """Once a lease expires and the job is handed out again, the old worker's outcome is dropped"""
+    with tempfile.TemporaryDirectory() as directory:
+        session_factory = make_session_factory(directory)
+        db = session_factory()
+        enqueue(db, 'scrape_stock', {'symbol': 'AAPL'})
+
+        stale = dequeue(db, 'worker-1', visibility_timeout=60)
+        stale.run_at = datetime.now() - timedelta(seconds=1)
+        db.commit()
+        other_db = session_factory()
+        current = dequeue(other_db, 'worker-2', visibility_timeout=60)
+
+        assert current.id == stale.id
+        assert not complete(db, stale, {'ok': True}, 'worker-1')
+        assert not fail(db, stale, 'boom', 'worker-1')
+
+        job = session_factory().get(Job, stale.id)
+        assert job.status == 'running' and job.locked_by == 'worker-2' and job.result is None
+
+def test_heartbeat_keeps_long_jobs_leased():
+    """A job running past its visibility timeout is not handed to another worker"""
+    with tempfile.TemporaryDirectory() as directory:
+        session_factory = make_session_factory(directory)
+        db = session_factory()
+        stolen = []
+
+        def slow_job(handler_db, scraper):
+            time.sleep(1.5)
+            stolen.append(dequeue(session_factory(), 'worker-2', visibility_timeout=1))
+            return {'slept': 1.5}
+
+        job_queue.JOB_HANDLERS['slow_job'] = slow_job
+        try:
+            enqueue(db, 'slow_job')
+            job = dequeue(db, 'worker-1', visibility_timeout=1)
+            assert run_job(db, job, scraper=object(), visibility_timeout=1, session_factory=session_factory)
+        finally:
+            del job_queue.JOB_HANDLERS['slow_job']
+
+        assert stolen == [None]
+        assert session_factory().get(Job, job.id).status == 'done'
+
+def main():
+    """Main test function"""
+
+    test_stale_worker_cannot_overwrite_new_owner()
+    test_heartbeat_keeps_long_jobs_leased()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,53 @@
+"""
+Test script for the news row date parser
+"""
+
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from news_dates import NewsDateParser, parse_stamp
+
+NOW = datetime(2025, 10, 16, 12, 0)
+
+def test_carries_date_forward_to_time_only_rows():
+    """Time-only rows inherit the date of the previous dated row"""
+    parser = NewsDateParser(now=NOW)
+
+    assert parser.parse('Oct-15-25 06:05PM') == datetime(2025, 10, 15, 18, 5)
+    assert parser.parse('04:30PM') == datetime(2025, 10, 15, 16, 30)
+    assert parser.parse('Oct-14-25 12:01AM') == datetime(2025, 10, 14, 0, 1)
+    assert parser.parse('11:45AM') == datetime(2025, 10, 14, 11, 45)
+
+def test_other_layouts():
+    """Split date and time cells, relative days and unparsable text"""
+    parser = NewsDateParser(now=NOW)
+
+    assert parser.parse('10-15-25', '18:05') == datetime(2025, 10, 15, 18, 5)
+    assert parser.parse('Today 09:30AM') == datetime(2025, 10, 16, 9, 30)
+    assert parser.parse('Yesterday') == datetime(2025, 10, 15)
+    assert parser.parse('03-02') == datetime(2025, 3, 2)
+    assert parser.parse('Apple beats estimates') is None
+
+def test_repeated_stamps_are_memoized():
+    """Repeated raw strings are served from the cache"""
+    parse_stamp.cache_clear()
+    for _ in range(100):
+        parse_stamp('Oct-15-25 06:05PM')
+
+    assert parse_stamp.cache_info().hits == 99
+
+def main():
+    """Main test function"""
+
+    test_carries_date_forward_to_time_only_rows()
+    test_other_layouts()
+    test_repeated_stamps_are_memoized()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,78 @@
+"""
+Test script for batched news ingestion
+"""
+
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, NewsArticle
+from services import NewsService
+
+class CountingSession:
+    """Session proxy that counts commits"""
+
+    def __init__(self, session):
+        self._session = session
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+        self._session.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+def make_service() -> NewsService:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    return NewsService(CountingSession(sessionmaker(bind=engine)()), scraper=object())
+
+def article(index: int) -> dict:
+    return {
+        'title': f"Apple headline {index}",
+        'link': f"https://example.com/{index}",
+        'stock_symbol': 'AAPL',
+        'published_date': datetime(2025, 10, 15, 12, index % 60)
+    }
+
+def test_batches_commit_once():
+    """Each ingest batch is saved with a single commit"""
+    service = make_service()
+
+    counts = service.ingest_articles((article(index) for index in range(7)), batch_size=3)
+
+    assert counts == {'scraped': 7, 'saved': 7}
+    # three batches, then the watermark
+    assert service.db.commits == 3 + 1
+    assert service.db.query(NewsArticle).count() == 7
+
+def test_bad_row_only_rolls_back_itself():
+    """A row that fails to insert is skipped without losing the rest of its batch"""
+    service = make_service()
+    batch = [article(0), {**article(1), 'title': None}, article(2)]
+
+    saved = service.save_articles(batch)
+
+    assert saved == 2
+    assert service.db.commits == 1
+    assert sorted(link for link, in service.db.query(NewsArticle.link)) == [
+        'https://example.com/0', 'https://example.com/2'
+    ]
+
+def main():
+    """Main test function"""
+
+    test_batches_commit_once()
+    test_bad_row_only_rolls_back_itself()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,75 @@
+"""
+Test script for the quote page parser backends
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scraper import FinvizScraper, PARSER_BACKENDS
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'quote_AAPL.html')
+
+def load_fixture():
+    with open(FIXTURE_PATH, 'rb') as f:
+        return f.read()
+
+def test_backends_produce_identical_output():
+    """Every backend must match the html.parser reference output"""
+    content = load_fixture()
+
+    reference = FinvizScraper(parser_backend='html.parser').parse_quote_page(content, 'AAPL')
+
+    assert reference['stock'] is not None
+    assert reference['stock']['name'] == 'Apple Inc'
+    assert reference['stock']['price'] == 230.06
+    assert len(reference['news']) == 4
+
+    for backend in PARSER_BACKENDS:
+        result = FinvizScraper(parser_backend=backend).parse_quote_page(content, 'AAPL')
+        assert result == reference, f"{backend} output differs from html.parser"
+
+def test_backends_find_id_only_news_table():
+    """A news table marked only by its id survives the strainer next to the snapshot table"""
+    content = load_fixture().replace(b' class="fullview-news-outer news-table"', b'')
+
+    reference = FinvizScraper(parser_backend='html.parser').parse_quote_page(content, 'AAPL')
+
+    assert reference['stock'] is not None
+    assert len(reference['news']) == 4
+
+    for backend in PARSER_BACKENDS:
+        result = FinvizScraper(parser_backend=backend).parse_quote_page(content, 'AAPL')
+        assert result == reference, f"{backend} output differs from html.parser"
+
+def test_strainer_falls_back_without_quote_tables():
+    """Pages without the known tables are parsed in full"""
+    content = b'<html><body><table><tr><td><a href="https://a.com/1">Apple one</a></td></tr></table></body></html>'
+
+    scraper = FinvizScraper(parser_backend='strainer')
+
+    assert scraper._make_soup(content).find('a') is not None
+
+def test_unknown_backend_rejected():
+    """Unknown backends fail fast"""
+    try:
+        FinvizScraper(parser_backend='html5lib')
+    except ValueError:
+        return
+
+    raise AssertionError("Expected ValueError for unknown parser backend")
+
+def main():
+    """Main test function"""
+
+    test_backends_produce_identical_output()
+    test_backends_find_id_only_news_table()
+    test_strainer_falls_back_without_quote_tables()
+    test_unknown_backend_rejected()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
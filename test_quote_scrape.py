@@ -0,0 +1,69 @@
+"""
+Test script for scraping stock data and news from one quote page fetch
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, NewsArticle, Stock
+from scraper import FinvizScraper
+from services import NewsService, StockService
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'quote_AAPL.html')
+
+class CountingScraper(FinvizScraper):
+    """Serves the AAPL fixture for every quote page and counts the fetches"""
+
+    def __init__(self):
+        super().__init__()
+        self.fetches = 0
+        with open(FIXTURE_PATH, 'rb') as f:
+            self.content = f.read()
+
+    def _fetch_quote_page(self, symbol: str) -> bytes:
+        self.fetches += 1
+        return self.content
+
+def make_session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+def test_stock_scrape_saves_news_from_the_same_fetch():
+    """Scraping a stock fetches its page once and stores the page's news too"""
+    db = make_session()
+    scraper = CountingScraper()
+
+    stock = StockService(db, scraper=scraper).scrape_and_save_stock('AAPL')
+
+    assert stock.price == 230.06
+    assert scraper.fetches == 1
+    assert db.query(NewsArticle).count() == 4
+
+def test_news_scrape_saves_stock_from_the_same_fetch():
+    """Scraping a symbol's news fetches its page once and updates the stock row too"""
+    db = make_session()
+    scraper = CountingScraper()
+
+    result = NewsService(db, scraper=scraper).scrape_and_save_news('AAPL')
+
+    assert result['scraped'] == 4 and result['saved'] == 4 and result['stock_updated']
+    assert scraper.fetches == 1
+    assert db.query(Stock).filter(Stock.symbol == 'AAPL').count() == 1
+
+def main():
+    """Main test function"""
+
+    test_stock_scrape_saves_news_from_the_same_fetch()
+    test_news_scrape_saves_stock_from_the_same_fetch()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
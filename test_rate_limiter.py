@@ -0,0 +1,145 @@
+"""
+Test script for the adaptive upstream rate limiter
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limiter import AdaptiveRateLimiter, RateLimitedHTTPAdapter, parse_retry_after
+
+URL = 'https://finviz.com/quote.ashx?t=AAPL'
+
+class FakeClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+class SteppingRateLimiter(AdaptiveRateLimiter):
+    """Records how long each acquire had to wait and jumps the clock forward instead of sleeping"""
+
+    def __init__(self, *args, **kwargs):
+        self.waits = []
+        super().__init__(*args, **kwargs)
+
+    def acquire(self, timeout=None):
+        stats = self.stats()
+        wait = max(stats['blocked_for'], (1 - stats['tokens']) / self.rate if stats['tokens'] < 1 else 0.0)
+        self.waits.append(round(wait, 3))
+        self.clock.advance(wait)
+        return super().acquire(timeout=0)
+
+class StubTransport(HTTPAdapter):
+    """Answers every request with the next queued (status, headers)"""
+
+    def __init__(self, *args, **kwargs):
+        self.replies = []
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        status, headers = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.headers = requests.structures.CaseInsensitiveDict(headers)
+        response._content = b''
+        response._content_consumed = True
+        response.request = request
+        return response
+
+class StubRateLimitedAdapter(RateLimitedHTTPAdapter, StubTransport):
+    pass
+
+def make_limiter(clock: FakeClock, cls=AdaptiveRateLimiter) -> AdaptiveRateLimiter:
+    return cls(rate=2.0, min_rate=0.5, max_rate=2.2, burst=2, clock=clock)
+
+def test_aimd_rate_control():
+    """Successes add 0.05 req/s up to max_rate, throttles halve it down to min_rate"""
+    limiter = make_limiter(FakeClock())
+
+    for _ in range(3):
+        limiter.on_success()
+    assert limiter.stats()['rate'] == 2.15
+
+    for _ in range(3):
+        limiter.on_success()
+    assert limiter.stats()['rate'] == 2.2
+
+    limiter.on_throttle()
+    assert limiter.stats()['rate'] == 1.1
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.stats()['rate'] == 0.5
+
+def test_token_bucket_refills_at_rate():
+    """The burst is spent immediately, then tokens return at the current rate"""
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    assert limiter.acquire(timeout=0) and limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0)
+
+    clock.advance(0.5)
+    assert limiter.acquire(timeout=0)
+    assert limiter.stats()['requests'] == 3
+
+def test_retry_after_blocks_until_it_passes():
+    """A throttle empties the bucket and blocks every request for Retry-After seconds"""
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+
+    limiter.on_throttle(retry_after=5)
+    assert limiter.stats()['blocked_for'] == 5
+
+    clock.advance(4.9)
+    assert not limiter.acquire(timeout=0)
+    clock.advance(0.1)
+    assert limiter.acquire(timeout=0)
+
+def test_adapter_retries_throttled_responses_after_retry_after():
+    """429 and 503 lower the rate, wait out Retry-After and retry until the retries run out"""
+    clock = FakeClock()
+    limiter = make_limiter(clock, cls=SteppingRateLimiter)
+    adapter = StubRateLimitedAdapter(rate_limiter=limiter, throttle_retries=1)
+    adapter.replies += [(429, {'Retry-After': '7'}), (200, {}), (503, {'Retry-After': '3'}), (503, {})]
+    request = requests.Request('GET', URL).prepare()
+
+    assert adapter.send(request).status_code == 200
+    assert limiter.waits == [0.0, 7.0]
+    assert limiter.stats()['rate'] == 1.05
+
+    assert adapter.send(request).status_code == 503
+    assert limiter.waits[2:] == [0.0, 3.0]
+    assert limiter.stats()['rate'] == 0.5 and limiter.stats()['throttled'] == 3
+
+def test_parse_retry_after():
+    """Seconds are read as is, garbage is ignored and past dates mean no wait"""
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+
+def main():
+    """Main test function"""
+
+    test_aimd_rate_control()
+    test_token_bucket_refills_at_rate()
+    test_retry_after_blocks_until_it_passes()
+    test_adapter_retries_throttled_responses_after_retry_after()
+    test_parse_retry_after()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,68 @@
+"""
+Test script for freshness-gated refreshes
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base
+from refresh_coordinator import RefreshCoordinator
+from scraper import FinvizScraper
+
+class StubScraper(FinvizScraper):
+    """Serves a fixed quote page, or raises the given fetch error"""
+
+    def __init__(self, content: bytes = b'', error: Exception = None):
+        super().__init__()
+        self.content = content
+        self.error = error
+
+    def _fetch_quote_page(self, symbol: str) -> bytes:
+        if self.error:
+            raise self.error
+        return self.content
+
+def make_coordinator(scraper: FinvizScraper) -> RefreshCoordinator:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    return RefreshCoordinator(scraper=scraper, session_factory=sessionmaker(bind=engine), ttl=60, negative_ttl=3600)
+
+def test_failed_fetch_is_not_negative_cached():
+    """A throttled or failing upstream leaves the symbol free to retry"""
+    coordinator = make_coordinator(StubScraper(error=requests.HTTPError('429 Client Error: Too Many Requests')))
+
+    assert coordinator.claim('AAPL')
+    result = coordinator.refresh('AAPL')
+
+    assert 'Too Many Requests' in result['error']
+    assert coordinator.stats()['negative_cached'] == []
+    assert coordinator.claim('AAPL')
+
+def test_page_without_quote_data_is_negative_cached():
+    """A successful fetch with no snapshot table is not retried until the negative TTL expires"""
+    coordinator = make_coordinator(StubScraper(content=b'<html><body><p>Symbol not found</p></body></html>'))
+
+    assert coordinator.claim('ZZZZ')
+    result = coordinator.refresh('ZZZZ')
+
+    assert 'error' not in result and not result['stock_updated']
+    assert coordinator.stats()['negative_cached'] == ['ZZZZ']
+    assert not coordinator.claim('ZZZZ')
+
+def main():
+    """Main test function"""
+
+    test_failed_fetch_is_not_negative_cached()
+    test_page_without_quote_data_is_negative_cached()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
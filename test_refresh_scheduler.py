@@ -0,0 +1,64 @@
+"""
+Test script for the refresh scheduler ranking and market calendar
+"""
+
+import sys
+import os
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from market_calendar import is_market_open, nyse_early_closes, nyse_holidays
+from refresh_scheduler import rank_symbols
+
+NEW_YORK = ZoneInfo('America/New_York')
+
+def test_market_hours_calendar():
+    """Regular session, weekends, holidays and early closes"""
+    assert is_market_open(datetime(2025, 10, 15, 10, 0, tzinfo=NEW_YORK))
+    assert not is_market_open(datetime(2025, 10, 15, 9, 29, tzinfo=NEW_YORK))
+    assert not is_market_open(datetime(2025, 10, 15, 16, 0, tzinfo=NEW_YORK))
+    assert not is_market_open(datetime(2025, 10, 18, 12, 0, tzinfo=NEW_YORK))
+    assert not is_market_open(datetime(2025, 12, 25, 12, 0, tzinfo=NEW_YORK))
+    assert not is_market_open(datetime(2025, 11, 28, 13, 30, tzinfo=NEW_YORK))
+    assert is_market_open(datetime(2025, 11, 28, 12, 30, tzinfo=NEW_YORK))
+
+def test_holiday_rules_cover_any_year():
+    """Holidays and early closes follow the exchange rules past any hard-coded table"""
+    assert nyse_holidays(2028) == {
+        date(2028, 1, 17), date(2028, 2, 21), date(2028, 4, 14), date(2028, 5, 29), date(2028, 6, 19),
+        date(2028, 7, 4), date(2028, 9, 4), date(2028, 11, 23), date(2028, 12, 25),
+    }
+    assert nyse_early_closes(2028) == {date(2028, 7, 3), date(2028, 11, 24)}
+    assert date(2027, 12, 24) in nyse_holidays(2027) and date(2026, 7, 3) in nyse_holidays(2026)
+    assert date(2025, 1, 9) in nyse_holidays(2025)
+    assert not is_market_open(datetime(2028, 4, 14, 12, 0, tzinfo=NEW_YORK))
+    assert not is_market_open(datetime(2028, 7, 3, 13, 30, tzinfo=NEW_YORK))
+
+def test_ranks_by_staleness_and_popularity():
+    """Overdue and popular symbols come first, fresh unpopular ones are skipped"""
+    now = datetime(2025, 10, 15, 12, 0)
+    last_refreshed = {
+        'AAPL': now - timedelta(minutes=10),
+        'MSFT': now - timedelta(minutes=20),
+        'IBM': now - timedelta(minutes=5),
+        'NEW': None,
+    }
+
+    ranked = [symbol for symbol, _ in rank_symbols(last_refreshed, {'AAPL': 50.0}, now, target_age=900)]
+
+    assert ranked == ['NEW', 'AAPL', 'MSFT']
+
+def main():
+    """Main test function"""
+
+    test_market_hours_calendar()
+    test_holiday_rules_cover_any_year()
+    test_ranks_by_staleness_and_popularity()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,71 @@
+"""
+Test script for the screener based bulk fundamentals scraper
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from scraper import FinvizScraper
+from screener import FinvizScreener
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+class FixtureScraper(FinvizScraper):
+    """Serves saved screener pages instead of fetching them"""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def _fetch(self, url):
+        self.urls.append(url)
+        if '&r=21' in url:
+            return load_fixture('screener_overview_page2.html')
+        return load_fixture('screener_overview.html')
+
+def test_parses_overview_columns():
+    """Header labels are mapped onto Stock fields"""
+    screener = FinvizScreener(scraper=FixtureScraper())
+
+    rows = {row['symbol']: row for row in screener.parse_screener_page(load_fixture('screener_overview.html'))}
+
+    assert len(rows) == 20
+    assert rows['AAPL']['name'] == 'Apple Inc'
+    assert rows['AAPL']['price'] == 230.06
+    assert rows['AAPL']['change_percent'] == 0.75
+    assert rows['AAPL']['change'] == 1.71
+    assert rows['AAPL']['volume'] == 44389110
+    assert rows['AAPL']['market_cap'] == '3452.10B'
+    assert rows['JNJ']['name'] == 'Johnson & Johnson'
+    assert rows['TSLA']['change_percent'] == -2.95
+    assert rows['CRM']['change_percent'] is None and 'change' not in rows['CRM']
+
+def test_paginates_until_every_symbol_is_seen():
+    """One request per screener page, not per symbol"""
+    scraper = FixtureScraper()
+    screener = FinvizScreener(scraper=scraper, view='111', columns='')
+
+    results = screener.get_stocks_data(['aapl', 'MSFT', 'INTC', 'PFE', 'ZZZZ'])
+
+    assert sorted(results) == ['AAPL', 'INTC', 'MSFT', 'PFE']
+    assert results['INTC']['pe_ratio'] is None
+    assert len(scraper.urls) == 2
+    assert scraper.urls[0].endswith('/screener.ashx?v=111&t=AAPL,MSFT,INTC,PFE,ZZZZ')
+
+def main():
+    """Main test function"""
+
+    test_parses_overview_columns()
+    test_paginates_until_every_symbol_is_seen()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,87 @@
+"""
+Test script for draining the sentiment backlog in batches
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, NewsArticle
+from services import NewsService
+
+class CountingSession:
+    """Session proxy that counts commits"""
+
+    def __init__(self, session):
+        self._session = session
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+        self._session.commit()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+def make_service(article_count: int) -> NewsService:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([
+        NewsArticle(title=f"Shares rally on strong results {index}", link=f"https://example.com/{index}",
+                    stock_symbol='AAPL')
+        for index in range(article_count)
+    ])
+    session.commit()
+    return NewsService(CountingSession(session), scraper=object())
+
+def unscored_count(service: NewsService) -> int:
+    return service.db.query(NewsArticle).filter(NewsArticle.sentiment_score.is_(None)).count()
+
+def test_drains_backlog_in_committed_batches():
+    """Every article is scored once, one commit per batch"""
+    service = make_service(7)
+
+    result = service.analyze_backlog(mode='fast', batch_size=3)
+
+    assert result['analyzed_count'] == 7 and result['batches'] == 3
+    assert service.db.commits == 3
+    assert unscored_count(service) == 0
+
+def test_cursor_skips_rows_left_unscored():
+    """Rows a batch leaves unscored are not read again in the same drain"""
+    service = make_service(5)
+    columns = service.sentiment_columns
+    service.sentiment_columns = lambda result, analyzed_at=None: {**columns(result, analyzed_at), 'sentiment_score': None}
+
+    result = service.analyze_backlog(mode='fast', batch_size=2)
+
+    assert result['analyzed_count'] == 5 and result['batches'] == 3
+    assert unscored_count(service) == 5
+
+def test_max_articles_caps_the_drain():
+    """The cap shrinks the last batch and leaves the rest for later"""
+    service = make_service(10)
+
+    result = service.analyze_backlog(mode='fast', batch_size=4, max_articles=6)
+
+    assert result['analyzed_count'] == 6 and result['batches'] == 2
+    assert service.db.commits == 2
+    assert unscored_count(service) == 4
+
+def main():
+    """Main test function"""
+
+    test_drains_backlog_in_committed_batches()
+    test_cursor_skips_rows_left_unscored()
+    test_max_articles_caps_the_drain()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
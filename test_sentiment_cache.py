@@ -0,0 +1,124 @@
+"""
+Test script for the sentiment result cache
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import sentiment_analyzer
+from config import Config
+from sentiment_analyzer import SentimentAnalyzer
+from sentiment_cache import SentimentCache
+
+TEXTS = [
+    "Apple beats earnings expectations, shares soar",
+    "",
+    "Tesla recalls vehicles after terrible crash reports",
+    "<b>Apple beats earnings expectations, shares soar</b>",
+]
+
+def test_batch_scores_each_text_once():
+    """Texts that clean to the same string share one cached result"""
+    analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+
+    results = analyzer.analyze_batch(TEXTS)
+
+    assert results[0] == results[3]
+    assert results[1] == analyzer._get_default_sentiment()
+    assert analyzer.cache.stats()['stored'] == 2
+
+def test_cached_results_match_fresh_analysis():
+    """Cache hits return the same values as a cold analysis, as independent copies"""
+    analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+
+    cold = [analyzer.analyze_sentiment(text) for text in TEXTS]
+    cold[0]['sentiment_label'] = 'changed'
+    warm = analyzer.analyze_batch(TEXTS)
+
+    assert warm[0]['sentiment_label'] != 'changed'
+    assert warm[2] == cold[2]
+    assert analyzer.cache.stats()['misses'] == 2
+
+def test_modes_are_cached_separately():
+    """Each mode runs only its own scorers and gets its own cache entry"""
+    analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+    text = "Great quarter with excellent gains"
+
+    fast = analyzer.analyze_sentiment(text, mode='fast')
+    balanced = analyzer.analyze_sentiment(text, mode='balanced')
+
+    assert fast['sentiment_mode'] == 'fast' and balanced['sentiment_mode'] == 'balanced'
+    assert fast['textblob_polarity'] == 0.0 and balanced['textblob_polarity'] > 0
+    assert fast['vader_compound'] == balanced['vader_compound']
+    assert analyzer.cache.stats()['stored'] == 2
+
+def test_cascade_escalates_only_uncertain_texts():
+    """Clear-cut texts skip the transformer, weak or conflicting ones are escalated"""
+    analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+
+    clear, weak = analyzer.analyze_batch(
+        ["Terrible losses and an awful outlook", "Shares flat ahead of the meeting"], mode='cascade'
+    )
+
+    assert not clear['sentiment_escalated'] and clear['sentiment_label'] == 'negative'
+    assert weak['sentiment_escalated']
+    assert analyzer.cascade_stats()['escalation_rate'] == 0.5
+
+def test_cache_keys_never_load_the_model():
+    """Building the cascade cache key leaves an unloaded model alone"""
+    analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+    analyzer._model_state = 'not_loaded'
+    loads = []
+    analyzer.load_transformers = lambda: loads.append(True) or False
+
+    analyzer.analyze_batch(["Terrible losses and an awful outlook"], mode='cascade')
+    analyzer.analyze_batch(["Terrible losses and an awful outlook"], mode='cascade')
+
+    assert loads == []
+    assert analyzer.cache.stats()['stored'] == 1
+
+def test_failed_model_is_not_ready_when_the_mode_needs_it():
+    """A load error is reported as not ready, unless the configured mode never runs the model"""
+    analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False))
+    analyzer._model_state = 'failed'
+    analyzer._model_error = 'model download failed'
+    configured_mode = Config.SENTIMENT_MODE
+    try:
+        Config.SENTIMENT_MODE = 'accurate'
+        status = analyzer.model_status()
+        assert not status['ready'] and status['error'] == 'model download failed'
+
+        Config.SENTIMENT_MODE = 'balanced'
+        assert analyzer.model_status()['ready']
+    finally:
+        Config.SENTIMENT_MODE = configured_mode
+
+def test_onnx_backend_falls_back_to_torch_without_its_modules():
+    """Selecting ONNX without every module its export needs uses the torch backend"""
+    missing_modules = sentiment_analyzer.ONNX_MISSING_MODULES
+    try:
+        sentiment_analyzer.ONNX_MISSING_MODULES = ['onnx']
+        analyzer = SentimentAnalyzer(cache=SentimentCache(persistent=False), backend='onnx')
+    finally:
+        sentiment_analyzer.ONNX_MISSING_MODULES = missing_modules
+
+    assert analyzer.backend == 'torch'
+
+def main():
+    """Main test function"""
+
+    test_batch_scores_each_text_once()
+    test_cached_results_match_fresh_analysis()
+    test_modes_are_cached_separately()
+    test_cascade_escalates_only_uncertain_texts()
+    test_cache_keys_never_load_the_model()
+    test_failed_model_is_not_ready_when_the_mode_needs_it()
+    test_onnx_backend_falls_back_to_torch_without_its_modules()
+
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
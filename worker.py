@@ -0,0 +1,120 @@
+"""
+Job queue worker
+Usage: python worker.py [--threads 2] [--once] [--sentiment-stage]
+
+Runs scraping and sentiment jobs from the jobs table. Start as many worker
+processes as needed; they coordinate through SKIP LOCKED dequeues.
+With --sentiment-stage one extra thread keeps scoring newly scraped
+articles, draining the unanalyzed backlog every interval.
+"""
+
+import sys
+import os
+import argparse
+import logging
+import signal
+import socket
+import threading
+
+from config import Config
+from database import SessionLocal, create_tables
+from job_queue import dequeue, run_job
+from scraper import FinvizScraper
+from services import NewsService
+from parse_pipeline import close_parse_pool
+from sentiment_pool import close_lexicon_pool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def work(worker_id: str, stop: threading.Event, once: bool = False, poll_interval: float = None) -> int:
+    """Process jobs until stopped, or until the queue is empty when once is set"""
+    poll_interval = Config.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+    scraper = FinvizScraper()
+    processed = 0
+
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            job = dequeue(db, worker_id)
+            if job is None:
+                if once:
+                    break
+                stop.wait(poll_interval)
+                continue
+
+            logger.info(f"{worker_id} running job {job.id} ({job.kind}), attempt {job.attempts}")
+            run_job(db, job, scraper)
+            processed += 1
+        except Exception as e:
+            logger.error(f"{worker_id} failed to process a job: {e}")
+            stop.wait(poll_interval)
+        finally:
+            db.close()
+
+    return processed
+
+def run_sentiment_stage(stop: threading.Event, mode: str = None, interval: float = None, once: bool = False) -> int:
+    """Drain the sentiment backlog, wait for new articles and repeat until stopped, or drain once"""
+    interval = Config.SENTIMENT_STAGE_INTERVAL if interval is None else interval
+    analyzed = 0
+
+    while not stop.is_set():
+        db = SessionLocal()
+        try:
+            result = NewsService(db).analyze_backlog(mode=mode, stop=stop)
+            if result['analyzed_count']:
+                analyzed += result['analyzed_count']
+                logger.info(f"Sentiment stage scored {result['analyzed_count']} articles "
+                            f"at {result['articles_per_second']}/s ({result['mode']})")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Sentiment stage failed: {e}")
+        finally:
+            db.close()
+        if once:
+            break
+        stop.wait(interval)
+
+    return analyzed
+
+def main():
+    parser = argparse.ArgumentParser(description='Run queued scraping and sentiment jobs')
+    parser.add_argument('--threads', type=int, default=Config.WORKER_THREADS, help='Worker threads in this process')
+    parser.add_argument('--once', action='store_true', help='Exit once no runnable job is left')
+    parser.add_argument('--poll-interval', type=float, default=Config.JOB_POLL_INTERVAL, help='Seconds to wait when the queue is empty')
+    parser.add_argument('--sentiment-stage', action='store_true', help='Also keep scoring unanalyzed articles')
+    parser.add_argument('--sentiment-mode', default=None, help='Analysis mode of the sentiment stage')
+
+    args = parser.parse_args()
+
+    create_tables()
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    results = [0] * args.threads
+
+    def run(index: int):
+        results[index] = work(f"{base_id}:{index}", stop, args.once, args.poll_interval)
+
+    threads = [threading.Thread(target=run, args=(index,), daemon=True) for index in range(args.threads)]
+    if args.sentiment_stage:
+        threads.append(threading.Thread(target=run_sentiment_stage, args=(stop, args.sentiment_mode, None, args.once),
+                                        name='sentiment-stage', daemon=True))
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        for thread in threads:
+            thread.join(timeout=0.5)
+
+    close_parse_pool()
+    close_lexicon_pool()
+    logger.info(f"Worker {base_id} stopped after {sum(results)} jobs")
+    return 0
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)